@@ -0,0 +1,4 @@
+# Benchmarks for rangeplus
+#
+# Run all of them from the project root with:  python -m benchmarks
+# See python -m benchmarks --help for JSON output and comparison of runs.
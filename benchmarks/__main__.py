@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Run all the benchmarks
+#
+#   python -m benchmarks                          print the results
+#   python -m benchmarks --json out.json          also save them as JSON
+#   python -m benchmarks --compare base.json      print the ratio to a previous run
+#   python -m benchmarks --select int/Range       only the speed cases matching a substring
+#   python -m benchmarks --pyperf                 time the speed cases with pyperf (if installed)
+
+import argparse, json, platform, sys
+from . import bench_memory, bench_speed
+
+def metadata():
+    return {
+        'python': platform. python_version(),
+        'implementation': platform. python_implementation(),
+        'platform': platform. platform(),
+        'numpy': getattr( bench_speed. numpy, '__version__', None ),
+    }
+
+# Time the speed cases in a pyperf Runner, which takes over the command line
+def run_pyperf( select ):
+    import pyperf
+    sys. argv[ 1: ] = []
+    runner = pyperf. Runner()
+    for subject, impl, op, fn in bench_speed. cases():
+        name = '%s/%s/%s' % ( subject, impl, op )
+        if select in name:
+            runner. bench_func( name, fn )
+
+def main():
+    parser = argparse. ArgumentParser( prog = 'python -m benchmarks', description = 'Benchmark rangeplus' )
+    parser. add_argument( '--json', help = 'save the results to this file' )
+    parser. add_argument( '--compare', help = 'compare to the results saved in this file' )
+    parser. add_argument( '--select', default = '', help = 'only run speed cases whose subject/impl/op contains this' )
+    parser. add_argument( '--repeat', type = int, default = 3, help = 'timing rounds per case' )
+    parser. add_argument( '--no-memory', action = 'store_true', help = 'skip the memory benchmark' )
+    parser. add_argument( '--pyperf', action = 'store_true', help = 'run the speed cases with pyperf instead' )
+    args = parser. parse_args()
+    if args. pyperf:
+        return run_pyperf( args. select )
+    base = {}
+    if args. compare:
+        with open( args. compare ) as f:
+            base = {( r[ 'subject' ], r[ 'impl' ], r[ 'op' ]): r[ 'seconds' ] for r in json. load( f )[ 'speed' ]}
+    report = { 'metadata': metadata(), 'speed': [], 'memory': []}
+    for result in bench_speed. results( args. select, args. repeat ):
+        report[ 'speed' ]. append( result )
+        key = ( result[ 'subject' ], result[ 'impl' ], result[ 'op' ])
+        ratio = '  x%.2f' % ( result[ 'seconds' ] / base[ key ], ) if key in base else ''
+        print( '%-10s %-6s %-10s %12.3f us%s' % ( key + ( result[ 'seconds' ] * 1e6, ratio )), flush = True )
+    if not args. no_memory:
+        report[ 'memory' ] = bench_memory. results()
+        for result in report[ 'memory' ]:
+            print( '%-28s %8.1f bytes' % ( result[ 'case' ], result[ 'bytes' ]))
+    if args. json:
+        with open( args. json, 'w' ) as f:
+            json. dump( report, f, indent = 2 )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Memory footprint of Range objects
+#
+# Allocate many instances and report the average number of bytes each one
+# holds, as traced by tracemalloc (the object itself plus anything it owns,
+# e.g. its int attributes and caches). Python range is shown for reference.
+#
+# Run from the project root with:  python -m benchmarks.bench_memory
+
+import gc, sys, tracemalloc
+sys. path. insert( 0, '.' )
+from rangeplus import Range
+
+COUNT = 100000
+
+def bytes_per_instance( factory, count = COUNT ):
+    gc. collect()
+    tracemalloc. start()
+    try:
+        before = tracemalloc. get_traced_memory()[ 0 ]
+        objects = [ factory( i ) for i in range( count )]
+        after = tracemalloc. get_traced_memory()[ 0 ]
+    finally:
+        tracemalloc. stop()
+    return ( after - before - sys. getsizeof( objects )) / count
+
+CASES = (
+    ( 'range(i, i + 1000, 7)', lambda i: range( i, i + 1000, 7 )),
+    ( 'Range(i, i + 1000, 7)', lambda i: Range( i, i + 1000, 7 )),
+    ( 'Range(i, None, 7)', lambda i: Range( i, None, 7 )),
+    ( 'Range(...) hashed', lambda i: ( lambda r: hash( r ) and r )( Range( i, i + 1000, 7 ))),
+    ( 'iter(Range(...))', lambda i: iter( Range( i, i + 1000, 7 ))),
+)
+
+def results():
+    return [{ 'case': name, 'bytes': bytes_per_instance( factory )} for name, factory in CASES ]
+
+def main():
+    for result in results():
+        print( '%-24s %8.1f bytes' % ( result[ 'case' ], result[ 'bytes' ]))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Speed of Range operations
+#
+# Time construction, iteration, membership, index, slicing, intersection,
+# hashing and pickling of int, big int, float, Fraction and unbound Ranges,
+# next to Python range and NumPy where they have an equivalent. Each case is
+# timed with timeit, the best of a few repeats is reported per call.
+#
+# Run from the project root with:  python -m benchmarks.bench_speed
+
+import pickle, sys, timeit
+from fractions import Fraction
+sys. path. insert( 0, '.' )
+from rangeplus import Range
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+N = 10**5
+
+# subject: ( Range arguments, a value in the middle, an intersecting Range )
+SUBJECTS = {
+    'int': (( 0, 7 * N, 7 ), 7 * ( N // 2 ), ( 3, 7 * N, 5 )),
+    'bigint': (( 2**70, 2**70 + 7 * N, 7 ), 2**70 + 7 * ( N // 2 ), ( 2**70 + 3, 2**70 + 7 * N, 5 )),
+    'float': (( 0.5, 0.5 + 0.25 * N, 0.25 ), 0.5 + 0.25 * ( N // 2 ), ( 0.75, 0.5 + 0.25 * N, 0.5 )),
+    'fraction': (( Fraction( 1, 3 ), Fraction( 1, 3 ) + Fraction( N, 6 ), Fraction( 1, 6 )),
+        Fraction( 1, 3 ) + Fraction( N // 2, 6 ), ( Fraction( 1, 2 ), Fraction( N, 6 ), Fraction( 1, 4 ))),
+    'unbound': (( 0, None, 7 ), 7 * ( N // 2 ), ( 3, None, 5 )),
+}
+
+# Return [( subject, implementation, operation, function )] for every case
+def cases():
+    result = []
+    for subject, ( args, value, other ) in SUBJECTS. items():
+        result += subject_cases( subject, args, value, other )
+    return result
+
+# The cases of one subject, in a scope of their own for the lambdas to bind
+def subject_cases( subject, args, value, other ):
+    result = []
+    add = lambda impl, op, fn: result. append(( subject, impl, op, fn ))
+    r, o = Range( *args ), Range( *other )
+    add( 'Range', 'construct', lambda: Range( *args ))
+    add( 'Range', 'iterate', lambda: sum( 1 for x in zip( r, range( N ))))
+    add( 'Range', 'contains', lambda: value in r )
+    add( 'Range', 'index', lambda: r. index( value ))
+    add( 'Range', 'slice', lambda: r[ 10:N // 2:3 ])
+    add( 'Range', 'and', lambda: r & o )
+    add( 'Range', 'hash', lambda: hash( Range( *args )))
+    add( 'Range', 'pickle', lambda: pickle. loads( pickle. dumps( r )))
+    if subject in ( 'int', 'bigint' ):
+        p, q = range( *args ), range( *other )
+        add( 'range', 'construct', lambda: range( *args ))
+        add( 'range', 'iterate', lambda: sum( 1 for x in zip( p, range( N ))))
+        add( 'range', 'contains', lambda: value in p )
+        add( 'range', 'index', lambda: p. index( value ))
+        add( 'range', 'slice', lambda: p[ 10:N // 2:3 ])
+        add( 'range', 'and', lambda: set( p ). intersection( q ))
+        add( 'range', 'hash', lambda: hash( range( *args )))
+        add( 'range', 'pickle', lambda: pickle. loads( pickle. dumps( p )))
+    if numpy is not None and subject in ( 'int', 'float' ):
+        a, b = numpy. arange( *args ), numpy. arange( *other )
+        add( 'numpy', 'construct', lambda: numpy. arange( *args ))
+        add( 'numpy', 'iterate', lambda: sum( 1 for x in zip( a, range( N ))))
+        add( 'numpy', 'contains', lambda: value in a )
+        add( 'numpy', 'index', lambda: numpy. searchsorted( a, value ))
+        add( 'numpy', 'slice', lambda: a[ 10:N // 2:3 ])
+        add( 'numpy', 'and', lambda: numpy. intersect1d( a, b, assume_unique = True ))
+        add( 'numpy', 'hash', lambda: hash( a. tobytes()))
+        add( 'numpy', 'pickle', lambda: pickle. loads( pickle. dumps( a )))
+    return result
+
+# Seconds per call of fn, the best of repeat rounds of at least 0.2 seconds each
+def seconds_per_call( fn, repeat = 3 ):
+    timer = timeit. Timer( fn )
+    number, _ = timer. autorange()
+    return min( timer. repeat( repeat, number )) / number
+
+def results( select = '', repeat = 3 ):
+    return [{ 'subject': subject, 'impl': impl, 'op': op, 'seconds': seconds_per_call( fn, repeat )}
+        for subject, impl, op, fn in cases() if select in '%s/%s/%s' % ( subject, impl, op )]
+
+def main():
+    for result in results( sys. argv[ 1 ] if len( sys. argv ) > 1 else '' ):
+        print( '%-10s %-6s %-10s %12.3f us' % ( result[ 'subject' ], result[ 'impl' ], result[ 'op' ], result[ 'seconds' ] * 1e6 ))
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,6 @@
-from .rangeplus import Range, Range_iterator
-__all__ = [ 'Range', 'Range_iterator' ]
+from .rangeplus import Range, Range_iterator, Range_aiterator, Range_permutation, Range_intersector, register_numeric_type
+from .rangearray import RangeArray
+from .rangeset import RangeSet
+from .dispenser import RangeDispenser
+__all__ = [ 'Range', 'Range_iterator', 'Range_aiterator', 'Range_permutation', 'Range_intersector', 'RangeArray', 'RangeSet', 'RangeDispenser', 'register_numeric_type' ]
 __version__ = '0.5'
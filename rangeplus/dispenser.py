@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#    rangeplus - Extended Python Range Class
+#    Copyright (c) 2016 Avner Herskovits
+#
+#    MIT License
+#
+#    Permission  is  hereby granted, free of charge, to any person  obtaining  a
+#    copy of this  software and associated documentation files (the "Software"),
+#    to deal in the Software  without  restriction, including without limitation
+#    the rights to use, copy, modify, merge,  publish,  distribute,  sublicense,
+#    and/or  sell  copies of  the  Software,  and to permit persons to whom  the
+#    Software is furnished to do so, subject to the following conditions:
+#
+#    The above copyright notice and this  permission notice shall be included in
+#    all copies or substantial portions of the Software.
+#
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT  WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE  WARRANTIES  OF  MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR  ANY  CLAIM,  DAMAGES  OR  OTHER
+#    LIABILITY, WHETHER IN AN  ACTION  OF  CONTRACT,  TORT OR OTHERWISE, ARISING
+#    FROM,  OUT  OF  OR  IN  CONNECTION WITH THE SOFTWARE OR THE  USE  OR  OTHER
+#    DEALINGS IN THE SOFTWARE.
+#
+
+
+# RangeDispenser hands out the elements of a Range to many threads in chunks.
+#
+# The Range is split into one part per worker slot, each guarded by its own
+# lock, so threads only contend when they take a chunk (never per element).
+# A slot holds pieces [r, i, j]: elements i..j-1 of the Range r are yet to be
+# handed out (j is None if r is unbound). Chunks get smaller towards the end
+# of a piece, and a thread whose slot is empty steals half the work of the
+# busiest slot. Chunks are in progress from take() until done(), so that
+# checkpoint() can return whatever is not completed.
+
+import operator, os, threading
+from itertools import count
+from .rangeplus import Range
+
+_range = lambda r: r if type( r ) is Range else Range( r )
+
+class RangeDispenser:
+    """
+    Thread-safe dispenser of the chunks of a Range, or of a list of Ranges such as a checkpoint
+    """
+    __slots__ = ( '_pieces', '_locks', '_active', '_active_lock', '_chunk_size', '_slots', '_local' )
+
+    def __init__( self, rng, chunk_size = 1024, workers = None ):
+        chunk_size = operator. index( chunk_size )
+        workers = ( os. cpu_count() or 1 ) if workers is None else operator. index( workers )
+        if chunk_size <= 0 or workers <= 0:
+            raise ValueError( 'chunk size and number of workers must be positive' )
+        if isinstance( rng, ( list, tuple )):
+            ranges = [ _range( r ) for r in rng ]
+        else:
+            rng = _range( rng )
+            if rng. length is None:
+                ranges = [ rng. shard( k, workers, 'strided' ) for k in range( workers )]
+            else:
+                ranges = rng. partition( workers )
+        self. _pieces = [[] for k in range( workers )]
+        for k, r in enumerate( ranges ):
+            if r. length != 0:
+                self. _pieces[ k % workers ]. append([ r, 0, r. length ])
+        self. _locks = [ threading. Lock() for k in range( workers )]
+        self. _active, self. _active_lock = set(), threading. Lock()
+        self. _chunk_size, self. _slots, self. _local = chunk_size, count(), threading. local()
+
+    # The slot of worker, or the slot assigned to the calling thread
+    def _slot( self, worker ):
+        if worker is not None:
+            if not 0 <= worker < len( self. _pieces ):
+                raise IndexError( 'worker out of range' )
+            return worker
+        try:
+            return self. _local. slot
+        except AttributeError:
+            self. _local. slot = next( self. _slots ) % len( self. _pieces )
+            return self. _local. slot
+
+    def take( self, worker = None ):
+        """
+        Return the next chunk for worker (by default for the calling thread) as a Range, and
+        mark it in progress; an empty Range is returned when there is nothing left
+        """
+        slot = self. _slot( worker )
+        while True:
+            with self. _locks[ slot ]:
+                pieces = self. _pieces[ slot ]
+                if pieces:
+                    piece = pieces[ 0 ]
+                    r, i, j = piece
+                    size = self. _chunk_size if j is None else min( self. _chunk_size, -( -( j - i ) // 2 ))
+                    chunk = r[ i:i + size ]
+                    piece[ 1 ] = i + size
+                    if piece[ 1 ] == j:
+                        del pieces[ 0 ]
+                    with self. _active_lock:
+                        self. _active. add( chunk )
+                    return chunk
+            if not self. _steal( slot ):
+                return Range( 0 )
+
+    # Move half of the remaining work of the busiest other slot to slot, return False if there is none
+    def _steal( self, slot ):
+        victim, most = None, 0
+        for other, lock in enumerate( self. _locks ):
+            if other != slot:
+                with lock:
+                    left = sum( j - i for r, i, j in self. _pieces[ other ] if j is not None )
+                if left > most:
+                    victim, most = other, left
+        if victim is None:
+            return False
+        first, second = sorted(( slot, victim ))
+        with self. _locks[ first ], self. _locks[ second ]:
+            pieces = [ piece for piece in self. _pieces[ victim ] if piece[ 2 ] is not None ]
+            if len( pieces ) > 1 or pieces and pieces[ 0 ][ 2 ] - pieces[ 0 ][ 1 ] == 1:
+                self. _pieces[ victim ]. remove( pieces[ -1 ])
+                self. _pieces[ slot ]. append( pieces[ -1 ])
+            elif pieces:
+                r, i, j = pieces[ 0 ]
+                pieces[ 0 ][ 2 ] = i + ( j - i ) // 2
+                self. _pieces[ slot ]. append([ r, pieces[ 0 ][ 2 ], j ])
+        return True
+
+    def done( self, chunk ):
+        """
+        Mark a chunk returned by take() as completed
+        """
+        with self. _active_lock:
+            if chunk not in self. _active:
+                raise ValueError( '%r is not in progress' % ( chunk, ))
+            self. _active. remove( chunk )
+
+    def __iter__( self ):
+        """
+        Iterate over the chunks for the calling thread, each one is done when the next one is requested
+        """
+        chunk = self. take()
+        while chunk:
+            yield chunk
+            self. done( chunk )
+            chunk = self. take()
+
+    @property
+    def remaining( self ):
+        """
+        Return the number of elements not handed out yet, None if unbound
+        """
+        left = 0
+        for slot, lock in enumerate( self. _locks ):
+            with lock:
+                for r, i, j in self. _pieces[ slot ]:
+                    if j is None:
+                        return None
+                    left += j - i
+        return left
+
+    def checkpoint( self ):
+        """
+        Return the elements that are not completed, in progress or not handed out yet,
+        as a list of Ranges from which a new RangeDispenser can resume
+        """
+        for lock in self. _locks:
+            lock. acquire()
+        try:
+            with self. _active_lock:
+                ranges = list( self. _active )
+            for pieces in self. _pieces:
+                ranges += [ r[ i:j ] for r, i, j in pieces ]
+            return ranges
+        finally:
+            for lock in self. _locks:
+                lock. release()
+
+    def __repr__( self ):
+        return 'RangeDispenser(%r, %d, %d)' % ( self. checkpoint(), self. _chunk_size, len( self. _pieces ))
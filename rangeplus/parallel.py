@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#    rangeplus - Extended Python Range Class
+#    Copyright (c) 2016 Avner Herskovits
+#
+#    MIT License
+#
+#    Permission  is  hereby granted, free of charge, to any person  obtaining  a
+#    copy of this  software and associated documentation files (the "Software"),
+#    to deal in the Software  without  restriction, including without limitation
+#    the rights to use, copy, modify, merge,  publish,  distribute,  sublicense,
+#    and/or  sell  copies of  the  Software,  and to permit persons to whom  the
+#    Software is furnished to do so, subject to the following conditions:
+#
+#    The above copyright notice and this  permission notice shall be included in
+#    all copies or substantial portions of the Software.
+#
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT  WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE  WARRANTIES  OF  MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR  ANY  CLAIM,  DAMAGES  OR  OTHER
+#    LIABILITY, WHETHER IN AN  ACTION  OF  CONTRACT,  TORT OR OTHERWISE, ARISING
+#    FROM,  OUT  OF  OR  IN  CONNECTION WITH THE SOFTWARE OR THE  USE  OR  OTHER
+#    DEALINGS IN THE SOFTWARE.
+#
+
+
+# Parallel map and reduce over the elements of a Range
+#
+# The Range is cut into sub-Ranges with Range.chunks(), and only these small
+# picklable descriptors are sent to the workers, which iterate them locally.
+# At most workers * prefetch chunks are in flight at any time, so an unbound
+# Range is streamed: a new chunk is submitted only when a result is taken.
+
+import os, concurrent. futures
+from collections import deque
+from functools import reduce
+from itertools import islice
+from .rangeplus import Range
+
+_BACKENDS = {
+    'process': concurrent. futures. ProcessPoolExecutor,
+    'thread': concurrent. futures. ThreadPoolExecutor,
+}
+
+# Largest default chunk size
+_CHUNK = 1 << 14
+
+_MISSING = object()
+
+# Worker side: map fn over the chunk r
+def _map_chunk( fn, r ):
+    return [ fn( value ) for value in r ]
+
+# Worker side: reduce the chunk r, or its image by fn, with combine
+def _reduce_chunk( fn, combine, r ):
+    return reduce( combine, r if fn is None else map( fn, r ))
+
+def _arguments( rng, workers, chunk, backend, prefetch ):
+    if type( rng ) is not Range:
+        rng = Range( rng )
+    if not isinstance( backend, concurrent. futures. Executor ) and backend not in _BACKENDS:
+        raise ValueError( "backend can be 'process', 'thread' or an Executor, not %r" % ( backend, ))
+    if workers is None:
+        workers = os. cpu_count() or 1
+    if workers <= 0 or prefetch <= 0:
+        raise ValueError( 'workers and prefetch must be positive' )
+    if chunk is None:
+        chunk = _CHUNK if rng. length is None else max( 1, min( _CHUNK, -( -int( rng. length ) // ( workers * 4 ))))
+    return rng, workers, rng. chunks( chunk )
+
+def _executor( backend, workers ):
+    if isinstance( backend, concurrent. futures. Executor ):
+        return backend, False
+    return _BACKENDS[ backend ]( max_workers = workers ), True
+
+# Submit task( *args, chunk ) for every chunk, keeping at most limit tasks in
+# flight, and yield their results in order or as they complete
+def _stream( backend, workers, prefetch, ordered, task, args, chunks ):
+    executor, owned = _executor( backend, workers )
+    pending = deque()
+    try:
+        for chunk in islice( chunks, workers * prefetch ):
+            pending. append( executor. submit( task, *args, chunk ))
+        while pending:
+            if ordered:
+                future = pending. popleft()
+            else:
+                done, _ = concurrent. futures. wait( pending, return_when = concurrent. futures. FIRST_COMPLETED )
+                future = next( iter( done ))
+                pending. remove( future )
+            result = future. result()
+            for chunk in islice( chunks, 1 ):
+                pending. append( executor. submit( task, *args, chunk ))
+            yield result
+    finally:
+        for future in pending:
+            future. cancel()
+        if owned:
+            executor. shutdown( wait = True, cancel_futures = True )
+
+def pmap( fn, rng, workers = None, chunk = None, backend = 'process', ordered = True, prefetch = 2 ):
+    """
+    Return an iterator over fn( value ) for the values of rng, computed in parallel
+    rng is cut into sub-Ranges of chunk values, which are mapped by a pool of workers
+    processes or threads (backend may also be a concurrent.futures.Executor); with
+    ordered false the results of each chunk are yielded as soon as it is done
+    With the process backend fn must be picklable, i.e. a module level function
+    """
+    rng, workers, chunks = _arguments( rng, workers, chunk, backend, prefetch )
+    return ( value for result in _stream( backend, workers, prefetch, ordered, _map_chunk, ( fn, ), chunks )
+        for value in result )
+
+def preduce( fn, rng, combine, initial = _MISSING, workers = None, chunk = None, backend = 'process', prefetch = 2 ):
+    """
+    Return the reduction by combine of fn( value ) for the values of the bound rng
+    (of the values themselves if fn is None), computed in parallel chunk by chunk
+    combine must be associative; partial results are combined in order
+    """
+    rng, workers, chunks = _arguments( rng, workers, chunk, backend, prefetch )
+    if rng. length is None:
+        raise ValueError( 'cannot reduce an unbound Range' )
+    partials = _stream( backend, workers, prefetch, True, _reduce_chunk, ( fn, combine ), chunks )
+    return reduce( combine, partials ) if initial is _MISSING else reduce( combine, partials, initial )
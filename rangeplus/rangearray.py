@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#    rangeplus - Extended Python Range Class
+#    Copyright (c) 2016 Avner Herskovits
+#
+#    MIT License
+#
+#    Permission  is  hereby granted, free of charge, to any person  obtaining  a
+#    copy of this  software and associated documentation files (the "Software"),
+#    to deal in the Software  without  restriction, including without limitation
+#    the rights to use, copy, modify, merge,  publish,  distribute,  sublicense,
+#    and/or  sell  copies of  the  Software,  and to permit persons to whom  the
+#    Software is furnished to do so, subject to the following conditions:
+#
+#    The above copyright notice and this  permission notice shall be included in
+#    all copies or substantial portions of the Software.
+#
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT  WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE  WARRANTIES  OF  MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR  ANY  CLAIM,  DAMAGES  OR  OTHER
+#    LIABILITY, WHETHER IN AN  ACTION  OF  CONTRACT,  TORT OR OTHERWISE, ARISING
+#    FROM,  OUT  OF  OR  IN  CONNECTION WITH THE SOFTWARE OR THE  USE  OR  OTHER
+#    DEALINGS IN THE SOFTWARE.
+#
+
+
+# RangeArray holds a large number of int Ranges column-wise, one NumPy array
+# per attribute, so that operations over all of them run vectorized.
+
+import operator
+from .rangeplus import Range, _IntEngine, _IntUnboundEngine, _INT64_MIN, _INT64_MAX
+
+# Below this magnitude the intersection arithmetic cannot overflow an int64
+_SMALL = 2**30
+
+def _optional_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+# Return the columns as int64 arrays if all their values fit, as object arrays otherwise
+def _pack( np, *columns ):
+    columns = [ np. asarray( column, dtype = object ) if type( column ) is list else column for column in columns ]
+    fits = all( column. dtype == np. int64 or column. size == 0 or
+        ( _INT64_MIN <= column. min() and column. max() <= _INT64_MAX ) for column in columns )
+    return [ column. astype( np. int64 if fits else object ) for column in columns ]
+
+# Vectorized _egcd(), return the arrays ( g, x ) where ax + by = g = gcd(a, b)
+def _egcd( np, a, b ):
+    x, u = np. zeros_like( a ), np. ones_like( a )
+    while True:
+        nonzero = a != 0
+        if not nonzero. any():
+            return b, x
+        divisor = np. where( nonzero, a, 1 )
+        q, r = b // divisor, b % divisor
+        b, a, x, u = np. where( nonzero, a, b ), np. where( nonzero, r, a ), np. where( nonzero, u, x ), np. where( nonzero, x - u * q, u )
+
+# Vectorized Range length, -1 for unbound rows
+def _length( np, start, stop, step, bound ):
+    empty = ( start == stop ) | (( start < stop ) ^ ( step > 0 ))
+    span = np. where( empty, 1, abs( stop - start ))
+    return np. where( bound, np. where( empty, 0, ( span - 1 ) // abs( step ) + 1 ), -1 )
+
+
+class RangeArray:
+    """
+    RangeArray(iterable) -> RangeArray object
+
+    Return an array of int Ranges stored column-wise: start, stop, step and
+    length are kept in parallel int64 NumPy arrays, or object arrays when a
+    value doesn't fit an int64, or lists when NumPy is not available.
+    Unbound rows have a length of -1 and their stop is meaningless.
+    """
+
+    __slots__ = ( '_start', '_stop', '_step', '_length', '_np' )
+
+    def __init__( self, ranges = ()):
+        """
+        Initialize self from an iterable of Range or range objects
+        """
+        start, stop, step, length = [], [], [], []
+        for r in ranges:
+            if type( r ) is not Range:
+                r = Range( r )
+            if r. _engine is not _IntEngine and r. _engine is not _IntUnboundEngine:
+                raise TypeError( 'RangeArray holds int Ranges only, got %r' % ( r, ))
+            start. append( r. _start )
+            stop. append( r. _start if r. _stop is None else r. _stop )
+            step. append( r. _step )
+            length. append( -1 if r. _length is None else r. _length )
+        np = _optional_numpy()
+        if np is not None:
+            start, stop, step, length = _pack( np, start, stop, step, length )
+        self. _init( np, start, stop, step, length )
+
+    def _init( self, np, start, stop, step, length ):
+        self. _np, self. _start, self. _stop, self. _step, self. _length = np, start, stop, step, length
+
+    @classmethod
+    def _from_columns( cls, np, start, stop, step, length ):
+        self = cls. __new__( cls )
+        self. _init( np, *_pack( np, start, stop, step, length ))
+        return self
+
+    @property
+    def start( self ): return self. _start
+
+    @property
+    def stop( self ): return self. _stop
+
+    @property
+    def step( self ): return self. _step
+
+    @property
+    def length( self ): return self. _length
+
+    @property
+    def bound( self ):
+        if self. _np is None:
+            return [ length >= 0 for length in self. _length ]
+        return self. _length >= 0
+
+    def __len__( self ):
+        """
+        Return len(self), the number of Ranges in self
+        """
+        return len( self. _start )
+
+    def _row( self, i ):
+        length = int( self. _length[ i ])
+        return Range( int( self. _start[ i ]), None if length < 0 else int( self. _stop[ i ]), int( self. _step[ i ]))
+
+    def __getitem__( self, key ):
+        """
+        Return the Range at row key, or a RangeArray of the rows selected by
+        a slice (or, with NumPy, an index array or a boolean mask)
+        """
+        np = self. _np
+        if type( key ) is not slice and ( np is None or type( key ) is not list and not isinstance( key, np. ndarray )):
+            return self. _row( operator. index( key ))
+        result = RangeArray. __new__( RangeArray )
+        result. _init( np, self. _start[ key ], self. _stop[ key ], self. _step[ key ], self. _length[ key ])
+        return result
+
+    def __iter__( self ):
+        """
+        Return iter(self), iterating over the rows as Range objects
+        """
+        return map( self. _row, range( len( self )))
+
+    def tolist( self ):
+        """
+        Return the rows of self as a list of Range objects
+        """
+        return list( self )
+
+    def __repr__( self ):
+        """
+        Return repr(self)
+        """
+        if len( self ) > 6:
+            rows = [ repr( r ) for r in self[ :3 ]] + [ '...' ] + [ repr( r ) for r in self[ -3: ]]
+        else:
+            rows = [ repr( r ) for r in self ]
+        return 'RangeArray([%s])' % ( ', '. join( rows ), )
+
+    def contains( self, value ):
+        """
+        Return for each row of self whether value is in it
+        """
+        np = self. _np
+        if np is None:
+            return [ value in r for r in self ]
+        start, stop, step, length = self. _start, self. _stop, self. _step, self. _length
+        ascending, bound = step > 0, length >= 0
+        if start. dtype == np. int64 and type( value ) is int and _INT64_MIN <= value <= _INT64_MAX:
+            # distances from start are taken as uint64, exact for every candidate row
+            value = np. int64( value )
+            candidate = np. where( ascending, ( start <= value ) & ( ~bound | ( value < stop )),
+                ( value <= start ) & ( ~bound | ( stop < value )))
+            unsigned, value = start. astype( np. uint64 ), value. astype( np. uint64 )
+            offset = np. where( ascending, value - unsigned, unsigned - value )
+            magnitude = np. where( ascending, step. astype( np. uint64 ), -step. astype( np. uint64 ))
+            return candidate & ( offset % magnitude == 0 )
+        start, stop, step = start. astype( object ), stop. astype( object ), step. astype( object )
+        candidate = np. where( ascending, ( start <= value ) & ( ~bound | ( value < stop )),
+            ( value <= start ) & ( ~bound | ( stop < value )))
+        return candidate & (( value - start ) % step == 0 ). astype( bool )
+
+    def __and__( self, other ):
+        """
+        Intersect self row by row with a RangeArray of the same length, or
+        every row with a single Range/range, and return a RangeArray.
+        Uses the same algorithm as Range.__and__.
+        """
+        if type( other ) is not RangeArray:
+            if type( other ) is not Range and type( other ) is not range:
+                return NotImplemented
+            other = RangeArray([ other ])
+            other = RangeArray( list( other ) * len( self )) if self. _np is None else other[ self. _np. zeros( len( self ), int )]
+        if len( other ) != len( self ):
+            raise ValueError( 'cannot intersect RangeArrays of lengths %s and %s' % ( len( self ), len( other )))
+        np = self. _np
+        if np is None:
+            return RangeArray([ a & b for a, b in zip( self, other )])
+        columns = ( self. _start, self. _stop, self. _step, other. _start, other. _stop, other. _step )
+        small = all( column. dtype == np. int64 and ( column. size == 0 or
+            ( -_SMALL < column. min() and column. max() < _SMALL )) for column in columns )
+        cast = ( lambda column: column ) if small else ( lambda column: column. astype( object ))
+        s0, e0, t0, n0 = cast( self. _start ), cast( self. _stop ), cast( self. _step ), self. _length
+        s1, e1, t1, n1 = cast( other. _start ), cast( other. _stop ), cast( other. _step ), other. _length
+        bound0, bound1 = n0 >= 0, n1 >= 0
+        empty = ( n0 == 0 ) | ( n1 == 0 )
+        # align both ranges in same direction by reversing other where needed
+        up, down = ( t0 > 0 ) & ( t1 < 0 ), ( t0 < 0 ) & ( t1 > 0 )
+        empty |= up & ( s0 > s1 ) | down & ( s0 < s1 )
+        limit = np. where( up, np. where( bound1, np. maximum( s0 - 1, e1 ), s0 - 1 ),
+            np. where( bound1, np. minimum( s0 + 1, e1 ), s0 + 1 ))
+        count = np. where( up, ( s1 - limit - 1 ) // np. where( up, -t1, 1 ), ( limit - s1 - 1 ) // np. where( down, t1, 1 )) + 1
+        flip = up | down
+        s1, e1 = np. where( flip, s1 + t1 * ( count - 1 ), s1 ), np. where( up, s1 + 1, np. where( down, s1 - 1, e1 ))
+        t1, bound1 = np. where( flip, -t1, t1 ), bound1 | flip
+        # now both directions are the same
+        step0, step1, sign, offset = abs( t0 ), abs( t1 ), np. where( t0 > 0, 1, -1 ), s1 - s0
+        gcd, x = _egcd( np, step0, step1 )
+        interval0, interval1 = step0 // gcd, step1 // gcd
+        step = interval0 * interval1 * gcd * sign
+        empty |= offset % gcd != 0
+        # Apply Chinese Remainder Theorem, reduced modulo interval1 to stay small
+        crt = step0 * (( offset // gcd % interval1 ) * ( x % interval1 ) % interval1 )
+        crt = np. where(( sign < 0 ) & ( crt != 0 ), crt + step, crt )
+        gap = offset - crt
+        filler = np. where( gap % step == 0, gap, ( gap // step + 1 ) * step )
+        filler = np. where(( sign > 0 ) & ( offset > 0 ) | ( sign < 0 ) & ( offset < 0 ), filler, 0 )
+        start = s0 + crt + filler
+        stop = np. where( bound0 & bound1, np. where( sign > 0, np. minimum( e0, e1 ), np. maximum( e0, e1 )),
+            np. where( bound0, e0, e1 ))
+        bound = bound0 | bound1
+        # the same empty Range as Range.__and__ returns
+        start, stop, step = np. where( empty, s0, start ), np. where( empty, s0, stop ), np. where( empty, t0 * t1, step )
+        bound |= empty
+        return RangeArray. _from_columns( np, start, stop, step, _length( np, start, stop, step, bound ))
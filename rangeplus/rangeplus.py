@@ -25,18 +25,615 @@
 #    DEALINGS IN THE SOFTWARE.
 #
 
+import collections, functools, itertools, math, operator, sys, types, weakref
+
+# Capabilities of types: a calculateable type implements the maths ops below,
+# an index type is not calculateable but has an __index__ method. Each type is
+# probed once and its kind is cached by id in _kinds, along with a weak reference
+# to the type that drops the entry when the type is collected.
+_NUMBER, _INDEX, _OTHER = 'number', 'index', 'other'
+_MATHS = ( '__eq__', '__ne__', '__gt__', '__ge__', '__lt__', '__le__',
+    '__add__', '__floordiv__', '__mod__', '__mul__', '__sub__' )
+_kinds, _kind_refs = { id( int ): _NUMBER, id( float ): _NUMBER }, {}
+
+def _remember( cls, kind ):
+    key = id( cls )
+    if key not in _kind_refs:
+        try:
+            _kind_refs[ key ] = weakref. ref( cls, lambda ref: ( _kinds. pop( key, None ), _kind_refs. pop( key, None )))
+        except TypeError:       # a type that cannot be weakly referenced is probed every time
+            return kind
+    _kinds[ key ] = kind
+    return kind
+
+def _classify( cls ):
+    if all( hasattr( cls, attr ) for attr in _MATHS ):
+        return _remember( cls, _NUMBER )
+    return _remember( cls, _INDEX if hasattr( cls, '__index__' ) else _OTHER )
+
+_kind = lambda cls: _kinds. get( id( cls )) or _classify( cls )
+
 # determine if a value can be treated as a number
-_calculateable = lambda value: type( value ) in ( int, float ) or \
-    all( hasattr( value, attr ) for attr in
-    ( '__eq__', '__ne__', '__gt__', '__ge__', '__lt__', '__le__',
-    '__add__', '__floordiv__', '__mod__', '__mul__', '__sub__' ))
+_calculateable = lambda value: _kind( type( value )) is _NUMBER
 
-def _normalize( value, msg ):
-    if _calculateable( value ):
+# Return value if it is calculateable, or its __index__ if calculateable, raise TypeError( msg % args ) otherwise
+def _normalize( value, msg, *args ):
+    kind = _kind( type( value ))
+    if kind is _NUMBER:
         return value
-    elif hasattr( value, '__index__' ):
-        return _normalize( value. __index__(), msg )
-    raise TypeError( msg )
+    elif kind is _INDEX:
+        return _normalize( value. __index__(), msg, *args )
+    raise TypeError( msg % args )
+
+def register_numeric_type( cls, exact = False ):
+    """
+    Register cls as a numeric type, so that its values are accepted by Range without
+    probing its methods. With exact true, Ranges of cls (possibly mixed with ints) are
+    computed on an integer lattice like Ranges of Fraction and Decimal, which requires
+    as_integer_ratio() and either a denominator (rationals) or as_tuple() (decimals).
+    """
+    if not isinstance( cls, type ):
+        raise TypeError( 'register_numeric_type() argument must be a type, not %s' % ( type( cls ), ))
+    _remember( cls, _NUMBER )
+    if exact:
+        _exact_types. add( cls )
+
+_normalize_arg = lambda value: _normalize( value, '%s object cannot be interpreted as an integer', type( value ))
+_normalize_stop = lambda value: None if value is None else _normalize_arg( value )
+_normalize_slice = lambda value: value if value is None \
+    else _normalize( value, 'slice indices must be integer-like or None or have an __index__ method' )
+
+# Return a triple (g, x, y), where ax + by = g = gcd(a, b)
+def _egcd( a, b ):
+    x, y, u, v = 0, 1, 1, 0
+    while a:
+        q, r = b // a, b % a
+        m, n = x - u * q, y - v * q
+        b, a, x, y, u, v = a, r, u, v, m, n
+    return b, x, y
+
+# min/max of two stops where None stands for an unbound stop
+_stop_min = lambda x, y: None if x is None and y is None else x if y is None else y if x is None else min( x, y )
+_stop_max = lambda x, y: None if x is None or y is None else max( x, y )
+_stop_max_inv = lambda x, y: None if x is None and y is None else x if y is None else y if x is None else max( x, y )
+
+# Exact (non-float) numeric types, whose Ranges use the _ExactEngine. Fraction
+# and Decimal are added when such a Range is first constructed, so that importing
+# rangeplus does not import fractions/decimal, others by register_numeric_type().
+_exact_types = { int }
+
+# Range is immutable, its slots are assigned in __init__ and caches through this
+_setattr = object. __setattr__
+
+# NumPy is optional, it is imported only by the operations that need it
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError( 'this operation requires NumPy' ) from None
+    return numpy
+
+_INT64_MIN, _INT64_MAX, _UINT64_MAX = -2**63, 2**63 - 1, 2**64 - 1
+
+# Exact division of ints where possible, true division otherwise
+def _divide( numerator, denominator ):
+    if type( numerator ) is int and numerator % denominator == 0:
+        return numerator // denominator
+    return numerator / denominator
+
+# Number of elements generated at a time when filling a buffer
+_FILL_BLOCK = 1 << 16
+
+# Suspend the running coroutine for one cycle of the event loop, like asyncio.sleep( 0 )
+@types. coroutine
+def _yield_control():
+    yield
+
+# Validate the number of parts a Range is split into
+def _shard_count( n ):
+    n = operator. index( n )
+    if n <= 0:
+        raise ValueError( 'number of parts must be positive' )
+    return n
+
+
+# Range engines
+#
+# The hot methods of Range (__contains__, count, index and __getitem__) are
+# implemented by an engine class that is selected once in Range.__init__ according
+# to the types of start, stop and step. The generic engine is the duck-typed
+# implementation that works for any calculateable type; the specialized engines
+# handle the common argument types on a straight-line path and defer to the
+# generic engine for anything else (slices, foreign types, linear searches).
+
+
+class _Engine:
+    """
+    Generic duck-typed engine, used for any calculateable start/stop/step
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def contains( r, value ):
+        if type( value ) is complex and value. imag == 0:
+            value = value. real
+        if _calculateable( value ):
+            return r. _value_in_range( value )
+        elif hasattr( value, '__eq__' ):
+            if r. _is_range_compatible:
+                return range( r. _start, r. _stop, r. _step ). __contains__( value )
+            else:
+                raise ValueError( 'cannot perform a linear search on this object' )
+        return False
+
+    @staticmethod
+    def count( r, value ):
+        if type( value ) is complex and value. imag == 0:
+            value = value. real
+        if _calculateable( value ):
+            return 1 if r. _value_in_range( value ) else 0
+        elif hasattr( value, '__eq__' ):
+            if r. _is_range_compatible:
+                return range( r. _start, r. _stop, r. _step ). count( value )
+            else:
+                raise ValueError( 'cannot perform a linear search on this object' )
+        return 0
+
+    @staticmethod
+    def index( r, value ):
+        if type( value ) is complex and value. imag == 0:
+            value = value. real
+        if _calculateable( value ):
+            if r. _value_in_range( value ):
+                return ( value - r. _start ) // r. _step
+            raise ValueError( '%s is not in Range' % ( value, ))
+        elif hasattr( value, '__eq__' ):
+            if r. _is_range_compatible:
+                return range( r. _start, r. _stop, r. _step ). index( value )
+            else:
+                raise ValueError( 'cannot perform a linear search on this object' )
+        raise ValueError( '%s is not in Range' % ( value, ))
+
+    @staticmethod
+    def getitem( r, key ):
+        # Handle slice notation
+        if type( key ) is slice:
+            start, stop, step = _normalize_slice( key. start ), _normalize_slice( key. stop ), _normalize_slice( key. step )
+            if step == 0:
+                raise ValueError( 'slice step cannot be zero' )
+            # Bound range
+            if r. _length is not None:
+                indices = slice( start, stop, step ). indices( r. _length )
+                return Range(
+                    r. _start + r. _step * indices[ 0 ],
+                    r. _start + r. _step * indices[ 1 ],
+                    r. _step * indices [ 2 ])
+            # Unbound range
+            fix_stop = 0
+            if step is None:
+                step = 1
+            if start is None and step < 0:
+                raise ValueError( 'cannot reverse an unbound slice of an unbound Range' )
+            if stop is None and step < 0:
+                stop, fix_stop = 0, r. _step
+            if start is not None and start < 0 or stop is not None and stop < 0:
+                raise IndexError( 'Negative index not allowed on unbound Range' )
+            # Unbound slice
+            if stop is None:
+                return Range( r[ start ] if start is not None else r. _start, None, r. _step * step )
+            # Bound slice
+            indices = slice( start, stop, step ). indices( 2 * stop if start is None else 2 * max( start, stop ))
+            return Range(
+                r. _start + r. _step * indices[ 0 ],
+                r. _start + r. _step * indices[ 1 ] - fix_stop,
+                r. _step * indices [ 2 ])
+        # handle fancy indexing by a list or an array of indices or a boolean mask
+        if type( key ) is list or r. _ndarray( key ) is not None:
+            return r. take( key )
+        # handle index notation
+        key = _normalize( key, 'Range indices cannot be %s', type( key ))
+        if r. _length is None:
+            if key < 0:
+                raise IndexError( 'Negative index not allowed on unbound Range' )
+        elif r. _length == 0 or not -r. _length <= key < r. _length:
+            raise IndexError( 'Range object index out of range' )
+        if key < 0:
+            key += r. _length
+        return r. _start + r. _step * key
+
+    @staticmethod
+    def iter( r ):
+        return Range_iterator( r. _start, r. _length, r. _step )
+
+    @staticmethod
+    def reversed( r ):
+        return Range_iterator( r. _last_item if r. _length else r. _start, r. _length, - r. _step )
+
+
+class _IntEngine( _Engine ):
+    """
+    Bound Range with int start, stop and step
+    """
+
+    # For an int value, divmod( value - start, step ) yields both the
+    # divisibility test and the index, regardless of the direction of step
+    @staticmethod
+    def contains( r, value ):
+        if type( value ) is int:
+            index, rem = divmod( value - r. _start, r. _step )
+            return rem == 0 and 0 <= index < r. _length
+        return _Engine. contains( r, value )
+
+    @staticmethod
+    def count( r, value ):
+        if type( value ) is int:
+            index, rem = divmod( value - r. _start, r. _step )
+            return 1 if rem == 0 and 0 <= index < r. _length else 0
+        return _Engine. count( r, value )
+
+    @staticmethod
+    def index( r, value ):
+        if type( value ) is int:
+            index, rem = divmod( value - r. _start, r. _step )
+            if rem == 0 and 0 <= index < r. _length:
+                return index
+            raise ValueError( '%s is not in Range' % ( value, ))
+        return _Engine. index( r, value )
+
+    @staticmethod
+    def getitem( r, key ):
+        if type( key ) is int:
+            if key < 0:
+                key += r. _length
+                if key < 0:
+                    raise IndexError( 'Range object index out of range' )
+            elif key >= r. _length:
+                raise IndexError( 'Range object index out of range' )
+            return r. _start + r. _step * key
+        return _Engine. getitem( r, key )
+
+    # Python range iterators are implemented in C and are picklable too
+    @staticmethod
+    def iter( r ):
+        return iter( range( r. _start, r. _stop, r. _step ))
+
+    @staticmethod
+    def reversed( r ):
+        return reversed( range( r. _start, r. _stop, r. _step ))
+
+
+class _IntUnboundEngine( _Engine ):
+    """
+    Unbound Range with int start and step
+    """
+
+    @staticmethod
+    def contains( r, value ):
+        if type( value ) is int:
+            index, rem = divmod( value - r. _start, r. _step )
+            return rem == 0 and 0 <= index
+        return _Engine. contains( r, value )
+
+    @staticmethod
+    def count( r, value ):
+        if type( value ) is int:
+            index, rem = divmod( value - r. _start, r. _step )
+            return 1 if rem == 0 and 0 <= index else 0
+        return _Engine. count( r, value )
+
+    @staticmethod
+    def index( r, value ):
+        if type( value ) is int:
+            index, rem = divmod( value - r. _start, r. _step )
+            if rem == 0 and 0 <= index:
+                return index
+            raise ValueError( '%s is not in Range' % ( value, ))
+        return _Engine. index( r, value )
+
+    @staticmethod
+    def getitem( r, key ):
+        if type( key ) is int:
+            if key < 0:
+                raise IndexError( 'Negative index not allowed on unbound Range' )
+            return r. _start + r. _step * key
+        return _Engine. getitem( r, key )
+
+
+class _NativeEngine( _Engine ):
+    """
+    Base for engines whose values of the Range's own numeric types skip the
+    duck-typing probe, anything else takes the generic path
+    """
+
+    native = ( int, float )
+
+    @classmethod
+    def contains( cls, r, value ):
+        if type( value ) in cls. native:
+            return r. _value_in_range( value )
+        return _Engine. contains( r, value )
+
+    @classmethod
+    def count( cls, r, value ):
+        if type( value ) in cls. native:
+            return 1 if r. _value_in_range( value ) else 0
+        return _Engine. count( r, value )
+
+    @classmethod
+    def index( cls, r, value ):
+        if type( value ) in cls. native:
+            if r. _value_in_range( value ):
+                return ( value - r. _start ) // r. _step
+            raise ValueError( '%s is not in Range' % ( value, ))
+        return _Engine. index( r, value )
+
+
+# The number of leading elements start + step * i, up to limit, for which before()
+# is true, where before() is true up to some index and false from it on. The
+# estimate may be off by rounding, by up to about ulp(bound) / |step| elements, so
+# the index is bisected within that bracket around it, widened if it falls short.
+def _float_count( start, step, before, estimate, bound, limit = None ):
+    slack = int( math. ulp( max( abs( start ), abs( bound ))) / abs( step )) + 2
+    lo, hi = max( 0, estimate - slack ), estimate + slack
+    while lo and not before( start + step * ( lo - 1 )):
+        lo, slack = max( 0, lo - slack ), slack * 2
+    while ( limit is None or hi < limit ) and before( start + step * hi ):
+        hi, slack = hi + slack, slack * 2
+    if limit is not None:
+        lo, hi = min( lo, limit ), min( hi, limit )
+    # before() is true below lo, and false from hi on unless hi is limit
+    while lo < hi:
+        middle = ( lo + hi ) // 2
+        if before( start + step * middle ):
+            lo = middle + 1
+        else:
+            hi = middle
+    return lo
+
+class _FloatEngine( _NativeEngine ):
+    """
+    Range with float (and int) start, stop and step
+    """
+
+    native = ( int, float )
+
+    # The elements are start + step * i as computed in float arithmetic, and the
+    # length and lookups are taken against them exactly: a value is in the Range
+    # only if it equals one of its elements, rather than if ( value - start ) % step
+    # happens to be zero.
+
+    @staticmethod
+    def length( start, stop, step ):
+        before = ( lambda value: value < stop ) if step > 0 else ( lambda value: value > stop )
+        estimate = -(( start - stop ) // step )
+        if not math. isfinite( estimate ):     # more elements than a float can count
+            raise ValueError( 'Range(%r, %r, %r) has too many elements' % ( start, stop, step ))
+        # the estimate may be off due to rounding, by many elements when step is below the ulp of stop
+        return _float_count( start, step, before, max( 0, int( estimate )), stop )
+
+    # The index of the element of r nearest to value, if value is within abs_tol or
+    # ulps units in the last place from it, None otherwise
+    @staticmethod
+    def nearest( r, value, abs_tol = 0.0, ulps = 0 ):
+        start, step = r. _start, r. _step
+        try:
+            guess = round(( value - start ) / step )
+        except ( ValueError, OverflowError ):     # NaN and infinities
+            return None
+        for index in ( guess, guess - 1, guess + 1 ):
+            if 0 <= index and ( r. _length is None or index < r. _length ):
+                item = start + step * index
+                if item == value or abs( item - value ) <= max( abs_tol, ulps * math. ulp( item )):
+                    return index
+        return None
+
+    # the same elements as iter(), a picklable map over the indices in reverse
+    @staticmethod
+    def reversed( r ):
+        return map( r. __getitem__, range( r. _length - 1, -1, -1 ))
+
+    @classmethod
+    def contains( cls, r, value ):
+        if type( value ) in cls. native:
+            return cls. nearest( r, value ) is not None
+        return _Engine. contains( r, value )
+
+    @classmethod
+    def count( cls, r, value ):
+        if type( value ) in cls. native:
+            return 0 if cls. nearest( r, value ) is None else 1
+        return _Engine. count( r, value )
+
+    @classmethod
+    def index( cls, r, value ):
+        if type( value ) in cls. native:
+            index = cls. nearest( r, value )
+            if index is None:
+                raise ValueError( '%s is not in Range' % ( value, ))
+            return index
+        return _Engine. index( r, value )
+
+
+class _ExactEngine( _Engine ):
+    """
+    Range with Fraction or Decimal (and int) start, stop and step
+    """
+
+    # The elements start + step * i are ( lattice_start + lattice_step * i ) / scale
+    # where scale is the common denominator of start and step (a power of ten for
+    # Decimals), so the hot methods run on ints and convert back to the type of the
+    # Range only on output. Unlike the other engines each exact Range has its own
+    # instance, holding its lattice.
+    # The quantum is None unless kind is Decimal, then it is the Decimal 1 / scale
+    __slots__ = ( 'kind', 'scale', 'quantum', 'start', 'step' )
+
+    def __init__( self, kind, start, step, scale = None ):
+        quantum = None
+        if kind is int:
+            scale = 1
+        elif hasattr( kind, 'as_tuple' ):
+            if scale is None:
+                scale = 10 ** max( 0, -_exponent( start ), -_exponent( step ))
+            quantum = kind( 1 ). scaleb( 1 - len( str( scale )))
+        elif scale is None:
+            a, b = start. denominator, step. denominator
+            scale = a // math. gcd( a, b ) * b
+        self. kind, self. scale, self. quantum = kind, scale, quantum
+        self. start, self. step = self. lattice( start ), self. lattice( step )
+
+    # value * scale if it is an int, None otherwise
+    def lattice( self, value ):
+        numerator, denominator = value. as_integer_ratio()
+        numerator *= self. scale
+        return numerator // denominator if numerator % denominator == 0 else None
+
+    # The number of lattice points from start before stop
+    def length( self, stop ):
+        numerator, denominator = stop. as_integer_ratio()
+        return max( 0, -(( self. start * denominator - numerator * self. scale ) // ( self. step * denominator )))
+
+    # The value of the lattice point n in the type of the Range
+    def value( self, n ):
+        if self. kind is int:
+            return n
+        if self. quantum is None:
+            return self. kind( n, self. scale )
+        return n * self. quantum
+
+    # Map an iterator over lattice points to their values
+    def values( self, points ):
+        if self. kind is int:
+            return points
+        if self. quantum is None:
+            return map( functools. partial( self. kind, denominator = self. scale ), points )
+        return map( self. quantum. __rmul__, points )
+
+    # The index of value in r, None if it is not in r
+    def _index( self, r, value ):
+        try:
+            n = self. lattice( value )
+        except ( ValueError, OverflowError ):     # NaN and infinities
+            return None
+        if n is None:
+            return None
+        index, rem = divmod( n - self. start, self. step )
+        return index if rem == 0 and 0 <= index and ( r. _length is None or index < r. _length ) else None
+
+    def contains( self, r, value ):
+        if type( value ) in _exact_types or type( value ) is float:
+            return self. _index( r, value ) is not None
+        return _Engine. contains( r, value )
+
+    def count( self, r, value ):
+        if type( value ) in _exact_types or type( value ) is float:
+            return 0 if self. _index( r, value ) is None else 1
+        return _Engine. count( r, value )
+
+    def index( self, r, value ):
+        if type( value ) in _exact_types or type( value ) is float:
+            index = self. _index( r, value )
+            if index is None:
+                raise ValueError( '%s is not in Range' % ( value, ))
+            return index
+        return _Engine. index( r, value )
+
+    def getitem( self, r, key ):
+        if type( key ) is int:
+            if key < 0:
+                if r. _length is None:
+                    raise IndexError( 'Negative index not allowed on unbound Range' )
+                key += r. _length
+                if key < 0:
+                    raise IndexError( 'Range object index out of range' )
+            elif r. _length is not None and key >= r. _length:
+                raise IndexError( 'Range object index out of range' )
+            return self. value( self. start + self. step * key )
+        return _Engine. getitem( r, key )
+
+    def iter( self, r ):
+        if r. _length is None:
+            return _Engine. iter( r )
+        return self. values( iter( range( self. start, self. start + self. step * r. _length, self. step )))
+
+    def reversed( self, r ):
+        return self. values( reversed( range( self. start, self. start + self. step * r. _length, self. step )))
+
+
+# The exponent of a Decimal, 0 for an int
+_exponent = lambda value: 0 if type( value ) is int else value. as_tuple(). exponent
+
+# False for the infinities and NaNs of Decimal
+_finite = lambda value: value is None or type( value ) is int or getattr( value, 'is_finite', lambda: True )()
+
+# floor(a / b) as an int, for Decimals too, whose // truncates towards zero
+def _floor_div( a, b ):
+    quotient = math. floor( a // b )
+    remainder = a - quotient * b
+    return quotient - 1 if remainder and ( remainder < 0 ) != ( b < 0 ) else quotient
+
+# Select the engine for a Range with the given (normalized) start, stop and step,
+# an exact Range gets an _ExactEngine instance unless it has infinite or NaN values
+def _select_engine( start, stop, step ):
+    kinds = { type( start ), type( step )}
+    if stop is not None:
+        kinds. add( type( stop ))
+    if kinds == { int }:
+        return _IntEngine if stop is not None else _IntUnboundEngine
+    kinds. discard( int )
+    if kinds == { float }:
+        return _FloatEngine
+    if len( kinds ) == 1:
+        kind = kinds. pop()
+        if kind not in _exact_types:
+            for module, name in (( 'fractions', 'Fraction' ), ( 'decimal', 'Decimal' )):
+                if module in sys. modules and kind is getattr( sys. modules[ module ], name, None ):
+                    _exact_types. add( kind )
+        if kind in _exact_types and all( _finite( value ) for value in ( start, stop, step )):
+            return _ExactEngine( int if type( start ) is int and type( step ) is int else kind, start, step )
+    return _Engine
+
+# Interned Ranges
+#
+# Range.interned() looks int arguments up in a typed LRU cache, so that a hit
+# skips __init__ altogether. On a miss, or for other arguments, the new Range is
+# looked up by its canonical form: the equivalence of __eq__ and __hash__ plus its
+# engine, the scale of an exact engine, the types of its start, stop and step and
+# the reprs of non-int start and step. An equal interned Range that behaves the
+# same is shared if there is one. Range has no __weakref__ slot (it would cost
+# every instance a pointer), so the canonical map is an LRU too.
+_INTERN_SIZE = 8192
+_interned_ranges = collections. OrderedDict()
+
+def _canonical( r ):
+    engine = r. _engine if isinstance( r. _engine, type ) else type( r. _engine )
+    types = ( engine, type( r. _start ), type( r. _stop ), type( r. _step ))
+    if engine is _ExactEngine:      # e.g. Decimals of different exponents are equal but print differently
+        types += ( r. _engine. scale, )
+    if r. _length == 0:
+        return types
+    values = ( r. _start, ) if r. _length == 1 else ( r. _start, r. _step, r. _length )
+    if engine is not _IntEngine and engine is not _IntUnboundEngine:     # and so are 0.0 and -0.0
+        values += tuple( map( repr, values[ : 2 ]))
+    return types + values
+
+# Return the interned Range equal to r, r itself if there is none
+def _share( r ):
+    key = _canonical( r )
+    shared = _interned_ranges. get( key )
+    if shared is None:
+        _interned_ranges[ key ] = shared = r
+        if len( _interned_ranges ) > _INTERN_SIZE:
+            _interned_ranges. popitem( last = False )
+    else:
+        _interned_ranges. move_to_end( key )
+    return shared
+
+# Arguments that are ints or None are equal only if they are the same, so that the
+# Range they make can be cached by them
+@functools. lru_cache( maxsize = _INTERN_SIZE, typed = True )
+def _intern( *args ):
+    return _share( Range( *args ))
 
 class Range:
     """
@@ -49,37 +646,74 @@ class Range:
     All arguments must be calculateable, i.e., implement maths ops
     +, -, *, %, // and all comparisons, or implement an __index__
     method that returns a calculateable
+    Range objects are immutable.
     """
 
+    # _hash and _last are left unset by __init__ and cached on first use
+    __slots__ = ( '_start', '_stop', '_step', '_length', '_sign', '_engine', '_hash', '_last' )
+
     def __init__( self, *args ):
         """
         Initilize self
         """
-        normalize = lambda value: _normalize( value, '%s object cannot be interpreted as an integer' % ( type( value ), ))
-        normalize_stop = lambda value: None if value is None else normalize( value )
         # calculate start, stop and step
-        if len( args ) is 0:
+        if len( args ) == 0:
             raise TypeError( 'Range expected 1 arguments, got 0' )      # argument(s) sic., same text as Python range
-        elif len( args ) is 1:
+        elif len( args ) == 1:
             if type( args[ 0 ]) is range:
-                self. _start, self. _stop, self. _step = args[ 0 ]. start, args[ 0 ]. stop, args[ 0 ]. step
+                start, stop, step = args[ 0 ]. start, args[ 0 ]. stop, args[ 0 ]. step
             else:
-                self. _start, self. _stop, self. _step = 0, normalize_stop( args[ 0 ]), 1
-        elif len( args ) is 2:
-            self. _start, self. _stop, self. _step = normalize( args[ 0 ]), normalize_stop( args[ 1 ]), 1
-        elif len( args ) is 3:
-            self. _start, self. _stop, self. _step = normalize( args[ 0 ]), normalize_stop( args[ 1 ]), normalize( args[ 2 ])
-            if self. _step == 0:
+                start, stop, step = 0, _normalize_stop( args[ 0 ]), 1
+        elif len( args ) == 2:
+            start, stop, step = _normalize_arg( args[ 0 ]), _normalize_stop( args[ 1 ]), 1
+        elif len( args ) == 3:
+            start, stop, step = _normalize_arg( args[ 0 ]), _normalize_stop( args[ 1 ]), _normalize_arg( args[ 2 ])
+            if step == 0:
                 raise ValueError( 'Range() arg 3 must not be zero' )
         else:
             raise TypeError( 'Range expected at most 3 arguments, got %s' % ( len( args ), ))
-        # calculate the length
-        if self. _stop is None:
-            self. _length = None
-        elif ( self. _start == self. _stop ) or (( self. _start < self. _stop ) ^ ( self. _step > 0 )):
-            self. _length = 0
+        # a float stop that is infinite in the direction of step leaves the Range unbound,
+        # start and step must be finite
+        if type( start ) is float and not math. isfinite( start ) or type( step ) is float and not math. isfinite( step ):
+            raise ValueError( 'Range() start and step must be finite' )
+        if type( stop ) is float and not math. isfinite( stop ):
+            if stop != stop:
+                raise ValueError( 'Range() stop must not be NaN' )
+            if ( stop > 0 ) == ( step > 0 ):
+                stop = None
+        # pick the implementation of the hot methods once
+        engine = _select_engine( start, stop, step )
+        # calculate the length, i.e. ceil(( stop - start ) / step )
+        if stop is None:
+            length = None
+        elif ( start == stop ) or (( start < stop ) ^ ( step > 0 )):
+            length = 0
+        elif isinstance( engine, _ExactEngine ):
+            length = engine. length( stop )
+        elif engine is _FloatEngine:
+            length = _FloatEngine. length( start, stop, step )
         else:
-            self. _length = ( abs( self. _stop - self. _start ) - 1 ) // abs( self. _step ) + 1
+            length = -(( start - stop ) // step )
+        _setattr( self, '_start', start )
+        _setattr( self, '_stop', stop )
+        _setattr( self, '_step', step )
+        _setattr( self, '_length', length )
+        _setattr( self, '_sign', 1 if step > 0 else -1 )
+        _setattr( self, '_engine', engine )
+
+    def __setattr__( self, name, value ):
+        raise AttributeError( 'Range object is immutable' )
+
+    def __delattr__( self, name ):
+        raise AttributeError( 'Range object is immutable' )
+
+    # pickle/copy by the initialization arguments, the same way Python range does
+    def __reduce__( self ):
+        return ( Range, ( self. _start, self. _stop, self. _step ))
+
+    # Pickles of the releases before __slots__ hold the instance __dict__ as their state
+    def __setstate__( self, state ):
+        self. __init__( state[ '_start' ], state[ '_stop' ], state[ '_step' ])
 
     @property
     def start( self ): return self. _start
@@ -103,57 +737,70 @@ class Range:
     def args( self ):
         return ( self. _start, self. _stop, self. _step )
 
+    @classmethod
+    def interned( cls, *args ):
+        """
+        Return a shared Range equal to Range(*args), the same instance for all equal
+        Ranges with the same types of start, stop and step that are interned (up to a bounded number of them)
+        Its stop, and its start and step when it has less than two elements, may be those
+        of an equal Range that was interned earlier. Unhashable arguments are not interned.
+        """
+        if cls is not Range:
+            return cls( *args )
+        if all( type( arg ) is int or arg is None for arg in args ):
+            return _intern( *args )
+        r = Range( *args )
+        try:
+            return _share( r )
+        except TypeError:
+            return r
+
+    @classmethod
+    def clear_interned( cls ):
+        """
+        Forget all interned Ranges
+        """
+        _intern. cache_clear()
+        _interned_ranges. clear()
+
+    @classmethod
+    def linspace( cls, start, stop, num = 50, endpoint = True ):
+        """
+        Return a float Range of num evenly spaced numbers from start to stop, like numpy.linspace,
+        with stop excluded if endpoint is false
+        The elements are start + step * i, so the last one may differ from stop by rounding
+        """
+        num = operator. index( num )
+        if num < 0:
+            raise ValueError( 'number of samples must be non-negative' )
+        start, stop = float( start ), float( stop )
+        step = ( stop - start ) / ( num - 1 if endpoint and num > 1 else num or 1 )
+        if step == 0:
+            if num > 1:
+                raise ValueError( 'Range cannot repeat %s' % ( start, ))
+            step = 1.0
+        # half a step past the last element, so that rounding cannot add or drop one
+        return cls( start, start + step * ( num - 0.5 ), step )
+
+    # The last element of a bound non-empty Range, None otherwise
+    @property
+    def _last_item( self ):
+        try:
+            return self. _last
+        except AttributeError:
+            last = None if not self. _length else self. _start + self. _step * ( self. _length - 1 )
+            _setattr( self, '_last', last )
+            return last
+
     def __getitem__( self, key ):
         """
-        Return self[key] or self[start:stop:step]
+        Return self[key] or self[start:stop:step] or self[[key, ...]]
         Index values must be of a calculateable type.
         Negative indices not allowed on unbound Range.
         When reversing an unbound Range the slice must be bound.
+        A list or NumPy array of indices or a boolean mask is handled by take().
         """
-        # Handle slice notation
-        if type( key ) is slice:
-            normalize = lambda value: value if value is None \
-                else _normalize( value, 'slice indices must be integer-like or None or have an __index__ method' )
-            start, stop, step = normalize( key. start ), normalize( key. stop ), normalize( key. step )
-            if step == 0:
-                raise ValueError( 'slice step cannot be zero' )
-            # Bound range
-            if self. _length is not None:
-                indices = slice( start, stop, step ). indices( self. _length )
-                return Range(
-                    self. _start + self. _step * indices[ 0 ],
-                    self. _start + self. _step * indices[ 1 ],
-                    self. _step * indices [ 2 ])
-            # Unbound range
-            fix_stop = 0
-            if step is None:
-                step = 1
-            if start is None and step < 0:
-                raise ValueError( 'cannot reverse an unbound slice of an unbound Range' )
-            if stop is None and step < 0:
-                stop, fix_stop = 0, self. _step
-            if start is not None and start < 0 or stop is not None and stop < 0:
-                raise IndexError( 'Negative index not allowed on unbound Range' )
-            # Unbound slice
-            if stop is None:
-                return Range( self[ start ] if start is not None else self. _start, None, self. _step * step )
-            # Bound slice
-            indices = slice( start, stop, step ). indices( 2 * stop if start is None else 2 * max( start, stop ))
-            return Range(
-                self. _start + self. _step * indices[ 0 ],
-                self. _start + self. _step * indices[ 1 ] - fix_stop,
-                self. _step * indices [ 2 ])
-        # handle index notation
-        index_in_range = lambda value: self. _length is None and ( value is None or 0 <= value ) or \
-            self. _length is not None and self. _length != 0 and -self. _length <= value < self. _length
-        key = _normalize( key, 'Range indices cannot be %s' % ( type( key ), ))
-        if self. _length is None and key < 0:
-            raise IndexError( 'Negative index not allowed on unbound Range' )
-        elif not index_in_range( key ):
-            raise IndexError( 'Range object index out of range' )
-        if key < 0:
-            key += self. _length
-        return self. _start + self. _step * key
+        return self. _engine. getitem( self, key )
 
     def _value_in_range( self, value ):
         if self. _stop is None:
@@ -186,16 +833,7 @@ class Range:
         Return value in self
         Optimize if value is calculateable, search linearly otherwise
         """
-        if type( value ) is complex and value. imag == 0:
-            value = value. real
-        if _calculateable( value ):
-            return self. _value_in_range( value )
-        elif hasattr( value, '__eq__' ):
-            if self. _is_range_compatible:
-                return range( self. _start, self. _stop, self. _step ). __contains__( value )
-            else:
-                raise ValueError( 'cannot perform a linear search on this object' )
-        return False
+        return self. _engine. contains( self, value )
 
     def count( self, value ):
         """
@@ -203,41 +841,206 @@ class Range:
         Return number of occurrences of value in self
         Optimize if value is calculateable, search linearly otherwise
         """
-        if type( value ) is complex and value. imag == 0:
-            value = value. real
-        if _calculateable( value ):
-            return 1 if self. _value_in_range( value ) else 0
-        elif hasattr( value, '__eq__' ):
-            if self. _is_range_compatible:
-                return range( self. _start, self. _stop, self. _step ). count( value )
-            else:
-                raise ValueError( 'cannot perform a linear search on this object' )
-        return 0
+        return self. _engine. count( self, value )
 
-    def index( self, value ):
+    def index( self, value, *, abs_tol = 0.0, ulps = 0 ):
         """
         self.index(value) -> integer
         Return index of value in self
         Optimize if value is calculateable, search linearly otherwise
+        With a tolerance, see contains(), return the index of the nearest element
         """
-        if type( value ) is complex and value. imag == 0:
-            value = value. real
-        if _calculateable( value ):
-            if self. _value_in_range( value ):
-                return ( value - self. _start ) // self. _step
-            raise ValueError( '%s is not in Range' % ( value, ))
-        elif hasattr( value, '__eq__' ):
-            if self. _is_range_compatible:
-                return range( self. _start, self. _stop, self. _step ). index( value )
-            else:
-                raise ValueError( 'cannot perform a linear search on this object' )
-        raise ValueError( '%s is not in Range' % ( value, ))
+        if abs_tol or ulps:
+            index = _FloatEngine. nearest( self, value, abs_tol, ulps )
+            if index is None:
+                raise ValueError( '%s is not in Range' % ( value, ))
+            return index
+        return self. _engine. index( self, value )
+
+    def contains( self, value, *, abs_tol = 0.0, ulps = 0 ):
+        """
+        Return value in self, where value may differ from an element of self by up to
+        abs_tol, or by up to ulps units in the last place of the element
+        Tolerances are meant for float Ranges
+        """
+        if abs_tol or ulps:
+            return _FloatEngine. nearest( self, value, abs_tol, ulps ) is not None
+        return self. _engine. contains( self, value )
+
+    # Batch lookups
+    #
+    # A NumPy array of values is matched with vectorized comparisons and modulo
+    # and yields NumPy arrays; any other iterable is matched value by value
+    # through the engine and yields lists.
+
+    def _ndarray( self, values ):
+        np = sys. modules. get( 'numpy' )
+        return np if np is not None and isinstance( values, np. ndarray ) else None
+
+    # Match an array of ints against a Range of ints exactly, whatever their magnitudes.
+    # The values that can be elements lie between lo and hi, the least and the greatest
+    # element that the dtype can hold, so their distances from lo (from hi when step is
+    # negative) fit a uint64 and are computed by the wrap-around of uint64 arithmetic.
+    # Indices are int64 when the greatest of them fits, Python ints otherwise. Return
+    # None if the step does not fit a uint64.
+    def _match_ints( self, np, values ):
+        start, step, length = self. _start, self. _step, self. _length
+        magnitude = abs( step )
+        if magnitude > _UINT64_MAX:
+            return None
+        if length == 0:
+            return np. zeros( values. shape, bool ), np. zeros( values. shape, np. int64 )
+        info = np. iinfo( values. dtype )
+        if step > 0:
+            lo, hi = max( start, int( info. min )), int( info. max ) if length is None else min( self. _last_item, int( info. max ))
+        else:
+            lo, hi = int( info. min ) if length is None else max( self. _last_item, int( info. min )), min( start, int( info. max ))
+        if lo > hi:
+            return np. zeros( values. shape, bool ), np. zeros( values. shape, np. int64 )
+        values = values. astype( np. uint64 )
+        if step > 0:
+            offset, skip = values - np. uint64( lo % 2**64 ), lo - start
+        else:
+            offset, skip = np. uint64( hi % 2**64 ) - values, start - hi
+        # the elements are at the offsets first + magnitude * k, whose index is base + k
+        first = -skip % magnitude
+        base = ( skip + first ) // magnitude
+        quotient, rem = np. divmod( offset, np. uint64( magnitude ))
+        hit = ( offset <= np. uint64( hi - lo )) & ( rem == np. uint64( first ))
+        if base + ( hi - lo ) // magnitude <= _INT64_MAX:
+            index = quotient. astype( np. int64 ) + np. int64( base )
+        else:
+            index = quotient. astype( object ) + base
+        return hit, np. where( hit, index, 0 )
+
+    # Match an array of values, return a pair of arrays ( hit, index ) where index
+    # is only meaningful where hit is True
+    def _match_many( self, np, values ):
+        start, stop, step, length = self. _start, self. _stop, self. _step, self. _length
+        if self. _engine is _IntEngine or self. _engine is _IntUnboundEngine:
+            if values. dtype. kind in 'iu':
+                matched = self. _match_ints( np, values )
+                if matched is not None:
+                    return matched
+            elif values. dtype. kind == 'f':
+                # integral floats in the int64 range are matched as int64, exactly
+                with np. errstate( invalid = 'ignore' ):
+                    integral = np. isfinite( values ) & ( values == np. floor( values ))
+                    inside = ( values >= -2.0**63 ) & ( values < 2.0**63 )
+                if not ( integral & ~inside ). any():
+                    matched = self. _match_ints( np, np. where( integral, values, 0 ). astype( np. int64 ))
+                    if matched is not None:
+                        return matched[ 0 ] & integral, matched[ 1 ]
+        if values. dtype. kind in 'iuf' and self. _engine is _FloatEngine:
+            values = values. astype( np. float64, copy = False )
+            with np. errstate( invalid = 'ignore' ):
+                index = np. rint(( values - start ) / step )
+                hit = ( index >= 0 ) & ( start + step * index == values )
+                if stop is not None:
+                    hit &= index < length
+                return hit, np. where( hit, index, 0 ). astype( np. int64 )
+        # anything else is matched one value at a time
+        flat = values. ravel(). tolist()
+        hit = np. fromiter(( self. _engine. contains( self, value ) for value in flat ), bool, len( flat ))
+        index = np. fromiter(( self. _engine. index( self, value ) if found else 0
+            for value, found in zip( flat, hit )), object, len( flat ))
+        return hit. reshape( values. shape ), index. reshape( values. shape )
+
+    def _check_mask( self, size ):
+        if self. _length is not None and size != self. _length:
+            raise IndexError( 'boolean index of size %s does not match Range of length %s' % ( size, self. _length ))
+
+    # Elements of self at an array of valid non-negative indices, as a NumPy array
+    def _numpy_take( self, np, index ):
+        start, step = self. _start, self. _step
+        if index. dtype == object:
+            pass
+        elif self. _engine is _IntEngine or self. _engine is _IntUnboundEngine:
+            if index. size == 0:
+                return np. zeros( index. shape, np. int64 )
+            bounds = start + step * int( index. min()), start + step * int( index. max())
+            if _INT64_MIN <= min( bounds ) and max( bounds ) <= _INT64_MAX:
+                # wrapping uint64 arithmetic is exact as the results fit an int64
+                values = index. astype( np. uint64 ) * np. uint64( step % 2**64 ) + np. uint64( start % 2**64 )
+                return values. view( np. int64 )
+        elif self. _engine is _FloatEngine:
+            return index. astype( np. float64 ) * step + start
+        values = np. empty( index. shape, object )
+        values. ravel()[ : ] = [ start + step * i for i in index. ravel(). tolist()]
+        return values
+
+    def take( self, indices ):
+        """
+        Return the elements of self at the given indices, a sequence of indices
+        or a boolean mask, with the same rules as self[key] for each index.
+        A NumPy array yields a NumPy array, anything else a list.
+        """
+        np = self. _ndarray( indices )
+        if np is None:
+            indices = list( indices )
+            if indices and all( type( i ) is bool for i in indices ):
+                self. _check_mask( len( indices ))
+                return [ self[ i ] for i, keep in enumerate( indices ) if keep ]
+            getitem = self. _engine. getitem
+            return [ getitem( self, i ) for i in indices ]
+        if indices. dtype == bool:
+            if indices. ndim != 1:
+                raise IndexError( 'boolean index must be one-dimensional' )
+            self. _check_mask( len( indices ))
+            return self. _numpy_take( np, np. flatnonzero( indices ))
+        if indices. dtype. kind not in 'iu':
+            raise IndexError( 'arrays used as indices must be of integer or boolean type' )
+        index = indices. astype( np. int64 ) if indices. dtype. kind == 'i' else indices. astype( object )
+        negative = index < 0
+        if self. _length is None:
+            if negative. any():
+                raise IndexError( 'Negative index not allowed on unbound Range' )
+        elif index. size:
+            if int( index. min()) < -self. _length or int( index. max()) >= self. _length:
+                raise IndexError( 'Range object index out of range' )
+            if negative. any():
+                index = np. where( negative, index + self. _length, index ) if self. _length <= _INT64_MAX \
+                    else np. where( negative, index. astype( object ) + self. _length, index )
+        return self. _numpy_take( np, index )
+
+    def contains_many( self, values ):
+        """
+        Return for each of values whether it is in self
+        """
+        np = self. _ndarray( values )
+        if np is None:
+            contains = self. _engine. contains
+            return [ contains( self, value ) for value in values ]
+        return self. _match_many( np, values )[ 0 ]
+
+    def count_many( self, values ):
+        """
+        Return for each of values the number of its occurrences in self
+        """
+        np = self. _ndarray( values )
+        if np is None:
+            count = self. _engine. count
+            return [ count( self, value ) for value in values ]
+        return self. _match_many( np, values )[ 0 ]. astype( np. intp )
+
+    def index_many( self, values, missing = -1 ):
+        """
+        Return for each of values its index in self, or missing if not in self
+        """
+        np = self. _ndarray( values )
+        if np is None:
+            contains, index = self. _engine. contains, self. _engine. index
+            return [ index( self, value ) if contains( self, value ) else missing for value in values ]
+        hit, index = self. _match_many( np, values )
+        return np. where( hit, index, missing )
 
     # According to Python range's implementation, range_a==range_b when tuple(range_a)==tuple(range_b)
     def __eq__( self, other ):
         """
         Return self==other
         """
+        if other is self:
+            return True
         other_type = type( other )
         if other_type is Range:
             other_len = other. length
@@ -266,30 +1069,63 @@ class Range:
         """
         Return hash(self)
         """
-        return hash( tuple() ) if self. _length == 0 \
-            else hash(( self. _start, )) if self. _length == 1 \
-            else hash(( self. _start, self. _step, self. _length ))
+        try:
+            return self. _hash
+        except AttributeError:
+            value = hash( tuple() ) if self. _length == 0 \
+                else hash(( self. _start, )) if self. _length == 1 \
+                else hash(( self. _start, self. _step, self. _length ))
+            _setattr( self, '_hash', value )
+            return value
 
     def __iter__( self ):
         """
         Return iter(self)
         """
-        return Range_iterator( self. _start, self. _length, self. _step )
+        return self. _engine. iter( self )
 
-    def __reversed__( self ):
+    def __aiter__( self ):
         """
-        Return reversed(self)
-        Not applicable on unbound range
+        Return an asynchronous iterator over self, see aiter()
         """
-        if self. _length is None:
-            raise ValueError( 'cannot reverse an unbound Range' )
-        return Range_iterator( self. _start + self. _step * ( self. _length - 1 ), self. _length, - self. _step )
+        return self. aiter()
 
-    def __len__( self ):
+    def aiter( self, batch = None, yield_every = 1024 ):
         """
-        Return len(self)
-        This method doesn't support unbound Range
-        Please use Range.length to get the length of any Range including unbound
+        Return an asynchronous iterator over self that yields control to the event loop
+        every yield_every items, or every yield_every lists of batch items if batch is given
+        """
+        return Range_aiterator( self. iterator(), batch, yield_every )
+
+    def abatches( self, n ):
+        """
+        Return an asynchronous iterator over lists of n items of self, that yields
+        control to the event loop between lists
+        """
+        return self. aiter( n, 1 )
+
+    def iterator( self, position = 0 ):
+        """
+        Return a seekable Range_iterator over self, advanced to position
+        """
+        it = Range_iterator( self. _start, self. _length, self. _step )
+        it. advance( position )
+        return it
+
+    def __reversed__( self ):
+        """
+        Return reversed(self)
+        Not applicable on unbound range
+        """
+        if self. _length is None:
+            raise ValueError( 'cannot reverse an unbound Range' )
+        return self. _engine. reversed( self )
+
+    def __len__( self ):
+        """
+        Return len(self)
+        This method doesn't support unbound Range
+        Please use Range.length to get the length of any Range including unbound
         """
         if self. _length is None:
             raise AttributeError( 'len() not available on unbound Range, please use Range.length instead' )
@@ -308,18 +1144,13 @@ class Range:
         Calculate the intersect of the two linear sets described by Range/range
         objects and return the result as a Range object.
         """
-        # Return a triple (g, x, y), where ax + by = g = gcd(a, b)
-        def egcd( a, b ):
-            x, y, u, v = 0, 1, 1, 0
-            while a:
-                q, r = b // a, b % a
-                m, n = x - u * q, y - v * q
-                b, a, x, y, u, v = a, r, u, v, m, n
-            return b, x, y
-        # more helpers
-        stop_min = lambda x, y: None if x is None and y is None else x if y is None else y if x is None else min( x, y )
-        stop_max = lambda x, y: None if x is None or y is None else max( x, y )
-        stop_max_inv = lambda x, y: None if x is None and y is None else x if y is None else y if x is None else max( x, y )
+        if not hasattr( other, 'step' ):     # let e.g. a RangeSet handle the operation
+            return NotImplemented
+        # exact ranges intersect exactly on their common integer lattice
+        if isinstance( self. _engine, _ExactEngine ) or isinstance( getattr( other, '_engine', None ), _ExactEngine ):
+            result = self. _exact_and( other )
+            if result is not None:
+                return result
         # return empty Range if either ranges is empty
         empty = lambda: Range( self. _start, self. _start, self. _step * other. step )
         if 0 == self. _length:
@@ -337,17 +1168,17 @@ class Range:
             elif other. stop is None:
                 other = Range( Range( other. start, self. _start - 1, other. step )[ -1 ], other. start + 1, - other. step )
             else:
-                other = Range( Range( other. start, stop_max( self. _start - 1, other. stop ), other. step )[ -1 ], other. start + 1, - other. step )
+                other = Range( Range( other. start, _stop_max( self. _start - 1, other. stop ), other. step )[ -1 ], other. start + 1, - other. step )
         elif self. _step < 0 and other. step > 0:
             if self. _start < other. start:     # return empty result
                 return empty()
             elif other. stop is None:
                 other = Range( Range( other. start, self. _start + 1, other. step )[ -1 ], other. start - 1, - other. step )
             else:
-                other = Range( Range( other. start, stop_min( self. _start + 1, other. stop ), other. step )[ -1 ], other. start - 1, - other. step )
+                other = Range( Range( other. start, _stop_min( self. _start + 1, other. stop ), other. step )[ -1 ], other. start - 1, - other. step )
         # now both directions are the same
-        step0, step1, sign, offset = abs( self. _step ), abs( other. step ), ( self. _step > 0 ) - ( self. _step < 0 ), other. start - self. _start
-        gcd, x, y = egcd( step0, step1 )
+        step0, step1, sign, offset = abs( self. _step ), abs( other. step ), self. _sign, other. start - self. _start
+        gcd, x, y = _egcd( step0, step1 )
         interval0, interval1 = step0 // gcd, step1 // gcd           # calculate the coprime intervals
         step = interval0 * interval1 * gcd * sign
         if offset % gcd != 0:                           # return empty result if offset not alligned on gcd
@@ -359,23 +1190,523 @@ class Range:
             gap = offset - crt
             filler = gap if 0 == gap % step else ( gap // step + 1 ) * step
         start = self. _start + crt + filler
-        stop = stop_min( self. _stop, other. stop ) if sign > 0 else stop_max_inv( self. _stop, other. stop )
+        stop = _stop_min( self. _stop, other. stop ) if sign > 0 else _stop_max_inv( self. _stop, other. stop )
         return Range( start, stop, step )
 
+    def intersector( self ):
+        """
+        Return a Range_intersector for intersecting self with many other Ranges
+        """
+        return Range_intersector( self )
+
+    def intersect_many( self, others ):
+        """
+        Return the list of self & other for each other in others, see intersector()
+        """
+        return Range_intersector( self ). intersect_many( others )
+
+    # Set relations
+    #
+    # Computed arithmetically for Ranges of ints and Python ranges, by the same
+    # number theory as intersector() but without building any Range. Other Ranges
+    # are compared through their intersection.
+
+    def _relation_terms( self, other ):
+        if type( other ) is not Range and type( other ) is not range:
+            other = Range( other )
+        return _progression( self ), _progression( other ), other
+
+    def isdisjoint( self, other ):
+        """
+        Return True if self and other have no elements in common
+        """
+        terms, other_terms, other = self. _relation_terms( other )
+        if terms is None or other_terms is None:
+            return ( self & other ). _length == 0
+        return not terms or not other_terms or _int_common( *terms, *other_terms ) is None
+
+    def overlap_count( self, other ):
+        """
+        Return the number of elements common to self and other, None if infinite
+        """
+        terms, other_terms, other = self. _relation_terms( other )
+        if terms is None or other_terms is None:
+            return ( self & other ). _length
+        common = terms and other_terms and _int_common( *terms, *other_terms )
+        if not common:
+            return 0
+        lo, hi, step = common
+        return None if lo is None or hi is None else ( hi - lo ) // step + 1
+
+    def issubset( self, other ):
+        """
+        Return True if every element of self is in other
+        """
+        terms, other_terms, other = self. _relation_terms( other )
+        if terms is None or other_terms is None:
+            return ( self & other ) == self
+        return not terms or bool( other_terms ) and _int_subset( *terms, *other_terms )
+
+    def issuperset( self, other ):
+        """
+        Return True if every element of other is in self
+        """
+        terms, other_terms, other = self. _relation_terms( other )
+        if terms is None or other_terms is None:
+            other = other if type( other ) is Range else Range( other )
+            return ( other & self ) == other
+        return not other_terms or bool( terms ) and _int_subset( *other_terms, *terms )
+
+    def count_between( self, lo, hi ):
+        """
+        Return the number of elements x of self such that lo <= x < hi, None if infinite
+        Either bound may be None for no bound.
+        """
+        start, step, length = self. _start, self. _step, self. _length
+        # infinite bounds are no bounds, a NaN bound admits nothing
+        lo = None if lo is not None and lo == -math. inf else lo
+        hi = None if hi is not None and hi == math. inf else hi
+        if length == 0 or any( bound is not None and ( bound != bound or abs( bound ) == math. inf ) for bound in ( lo, hi )):
+            return 0
+        # the elements in [lo, hi) are those from index first up to index end, excluded
+        if step > 0:
+            first = 0 if lo is None else max( 0, -_floor_div( start - lo, step ))
+            end = length if hi is None else max( 0, -_floor_div( start - hi, step ))
+        else:
+            first = 0 if hi is None else max( 0, _floor_div( start - hi, -step ) + 1 )
+            end = length if lo is None else max( 0, _floor_div( start - lo, -step ) + 1 )
+        if self. _engine is _FloatEngine:     # the elements are rounded, move the indices by their values
+            if step > 0:
+                first = first if lo is None else _float_count( start, step, lambda value: value < lo, first, lo, length )
+                end = end if hi is None else _float_count( start, step, lambda value: value < hi, end, hi, length )
+            else:
+                first = first if hi is None else _float_count( start, step, lambda value: value >= hi, first, hi, length )
+                end = end if lo is None else _float_count( start, step, lambda value: value >= lo, end, lo, length )
+        if end is None:
+            return None
+        if length is not None:
+            end = min( end, length )
+        return max( 0, end - first )
+
+    # Affine arithmetic
+    #
+    # Adding a scalar to a Range or multiplying it by one transforms its start,
+    # stop and step, so that the result holds the transformed elements in the same
+    # order. Float results may round differently from transforming each element,
+    # but they keep the length of the Range.
+
+    # Return the Range of k * x + c for the elements x of self
+    def _affine( self, k, c ):
+        if not _calculateable( k ) or not _calculateable( c ) or hasattr( k, '__len__' ) or hasattr( c, '__len__' ):
+            return NotImplemented
+        start, step, length = self. _start * k + c, self. _step * k, self. _length
+        if length is None:
+            return Range( start, None, step )
+        result = Range( start, self. _stop * k + c, step )
+        if result. _length != length:      # rounded off, stop half a step past the last element
+            result = Range( start, start + step * ( length - 0.5 ), step )
+        return result
+
+    def __add__( self, other ):
+        """
+        Return self+value, the Range of x+value for x in self
+        """
+        return self. _affine( 1, other )
+
+    __radd__ = __add__
+
+    def __sub__( self, other ):
+        """
+        Return self-value, the Range of x-value for x in self
+        """
+        if not _calculateable( other ):
+            return NotImplemented
+        return self. _affine( 1, -other )
+
+    def __rsub__( self, other ):
+        """
+        Return value-self, the Range of value-x for x in self
+        """
+        return self. _affine( -1, other )
+
+    def __mul__( self, other ):
+        """
+        Return self*value, the Range of x*value for x in self
+        """
+        return self. _affine( other, 0 )
+
+    __rmul__ = __mul__
+
+    def __neg__( self ):
+        """
+        Return -self
+        """
+        return self. _affine( -1, 0 )
+
+    def affine_preimage( self, a, b, target ):
+        """
+        Return the Range of the elements x of self such that a*x+b is in target, in the order of self
+        For ints it is computed arithmetically by the Chinese Remainder Theorem, like intersector().
+        """
+        if not _calculateable( a ) or not _calculateable( b ):
+            raise TypeError( 'affine_preimage() coefficients must be numbers' )
+        if type( target ) is not Range and type( target ) is not range:
+            target = Range( target )
+        empty = Range( self. _start, self. _start, self. _step )
+        if a == 0:
+            return self if self. _length != 0 and b in target else empty
+        terms, target_terms = _progression( self ), _progression( target )
+        if terms is None or target_terms is None or type( a ) is not int or type( b ) is not int:
+            # the intersection of the image with target, mapped back
+            common = ( self * a + b ) & target
+            if common. _length == 0:
+                return empty
+            start, step = _divide( common. _start - b, a ), _divide( common. _step, a )
+            return Range( start, None if common. _length is None else start + step * common. _length, step )
+        if not terms or not target_terms:
+            return empty
+        start, step, last = terms
+        common = _int_common( a * start + b, a * step, None if last is None else a * last + b, *target_terms )
+        if common is None:
+            return empty
+        # the bounds of the images map back to bounds of x, swapped if a is negative
+        lo, hi, step = common
+        if a < 0:
+            lo, hi = hi, lo
+        lo, hi, step = None if lo is None else ( lo - b ) // a, None if hi is None else ( hi - b ) // a, step // abs( a )
+        if self. _step > 0:
+            return Range( lo, None if hi is None else hi + step, step )
+        return Range( hi, None if lo is None else lo - step, -step )
+
+    # Return the intersection of self and other computed on int Ranges scaled to a
+    # common lattice, or None if they are not both exact Ranges of the same type
+    def _exact_and( self, other ):
+        if type( other ) is not Range:
+            other = Range( other )
+        engines = []
+        for r in ( self, other ):
+            if isinstance( r. _engine, _ExactEngine ):
+                engines. append( r. _engine )
+            elif r. _engine is _IntEngine or r. _engine is _IntUnboundEngine:
+                engines. append( _ExactEngine( int, r. _start, r. _step ))
+            else:
+                return None
+        kinds = { engine. kind for engine in engines } - { int }
+        if len( kinds ) > 1:
+            return None
+        scale = engines[ 0 ]. scale // math. gcd( engines[ 0 ]. scale, engines[ 1 ]. scale ) * engines[ 1 ]. scale
+        scaled = []
+        for r, engine in zip(( self, other ), engines ):
+            start, step = engine. start * ( scale // engine. scale ), engine. step * ( scale // engine. scale )
+            scaled. append( Range( start, None if r. _length is None else start + step * r. _length, step ))
+        result = scaled[ 0 ] & scaled[ 1 ]
+        value = _ExactEngine( kinds. pop() if kinds else int, 0, 0, scale ). value
+        return Range( value( result. _start ), None if result. _stop is None else value( result. _stop ), value( result. _step ))
+
+    # Aggregates
+    #
+    # Computed in O(1) by the arithmetic series formulas, exactly for int, Fraction
+    # and Decimal Ranges. Divisions of ints return an int when exact and a float
+    # otherwise, the same as statistics.mean() does.
+
+    @property
+    def first( self ):
+        """
+        The first element, None if self is empty
+        """
+        return None if self. _length == 0 else self. _start
+
+    @property
+    def last( self ):
+        """
+        The last element, None if self is empty or unbound
+        """
+        return self. _last_item
+
+    def _aggregate_length( self, name, nonempty = True ):
+        if self. _length is None:
+            raise ValueError( '%s() of an unbound Range' % ( name, ))
+        if nonempty and self. _length == 0:
+            raise ValueError( '%s() of an empty Range' % ( name, ))
+        return self. _length
+
+    def sum( self ):
+        """
+        Return the sum of the elements of self
+        """
+        n = self. _aggregate_length( 'sum', False )
+        return n * self. _start + self. _step * ( n * ( n - 1 ) // 2 )
+
+    def sum_of_squares( self ):
+        """
+        Return the sum of the squares of the elements of self
+        """
+        n, a, d = self. _aggregate_length( 'sum_of_squares', False ), self. _start, self. _step
+        return n * a * a + 2 * a * d * ( n * ( n - 1 ) // 2 ) + d * d * (( n - 1 ) * n * ( 2 * n - 1 ) // 6 )
+
+    def mean( self ):
+        """
+        Return the arithmetic mean of the elements of self
+        """
+        self. _aggregate_length( 'mean' )
+        return _divide( self. _start + self. _last_item, 2 )
+
+    def variance( self, ddof = 0 ):
+        """
+        Return the variance of the elements of self, sum((x - mean)**2) / (length - ddof)
+        The default ddof=0 is the population variance, ddof=1 the sample variance.
+        """
+        n = self. _aggregate_length( 'variance' )
+        if n - ddof <= 0:
+            raise ValueError( 'variance() requires more than %s elements' % ( ddof, ))
+        return _divide( self. _step * self. _step * ( n * ( n * n - 1 )), 12 * ( n - ddof ))
+
+    def min( self ):
+        """
+        Return the smallest element of self
+        """
+        if self. _step < 0:
+            self. _aggregate_length( 'min' )
+            return self. _last_item
+        if self. _length == 0:
+            raise ValueError( 'min() of an empty Range' )
+        return self. _start
+
+    def max( self ):
+        """
+        Return the largest element of self
+        """
+        if self. _step > 0:
+            self. _aggregate_length( 'max' )
+            return self. _last_item
+        if self. _length == 0:
+            raise ValueError( 'max() of an empty Range' )
+        return self. _start
+
+    # Chunked iteration
+
+    def chunks( self, size ):
+        """
+        Yield contiguous sub-Ranges of self of size elements each (the last
+        one may be shorter), endlessly if self is unbound
+        """
+        size = operator. index( size )
+        if size <= 0:
+            raise ValueError( 'chunk size must be positive' )
+        if self. _length is None:
+            return ( self[ i:i + size ] for i in itertools. count( 0, size ))
+        return ( self[ i:i + size ] for i in range( 0, int( self. _length ), size ))
+
+    def batches( self, size, as_ = list ):
+        """
+        Yield the elements of self in materialized blocks of size elements
+        as_ is list, tuple or 'numpy' (or the numpy module itself)
+        """
+        if as_ == 'numpy' or getattr( as_, '__name__', None ) == 'numpy':
+            _import_numpy()
+            return ( chunk. to_numpy() for chunk in self. chunks( size ))
+        if as_ is not list and as_ is not tuple:
+            raise ValueError( 'batches can be list, tuple or numpy, not %r' % ( as_, ))
+        return ( as_( chunk. _values( 0, int( chunk. _length ))) for chunk in self. chunks( size ))
+
+    # Partitioning
+
+    def partition( self, n ):
+        """
+        Return a list of n contiguous sub-Ranges of self whose lengths differ by at most one
+        """
+        n = _shard_count( n )
+        if self. _length is None:
+            raise ValueError( 'cannot partition an unbound Range, use a strided shard' )
+        length = int( self. _length )
+        return [ self[ length * i // n:length * ( i + 1 ) // n ] for i in range( n )]
+
+    def shard( self, i, n, mode = 'contiguous' ):
+        """
+        Return the i-th of n shards of self in O(1)
+        A contiguous shard is the i-th part of self.partition(n), a strided shard is every
+        n-th element of self starting from element i, and may be taken from an unbound Range
+        """
+        n, i = _shard_count( n ), operator. index( i )
+        if not 0 <= i < n:
+            raise IndexError( 'shard index out of range' )
+        if mode == 'strided':
+            return Range( self. _start + self. _step * i, self. _stop, self. _step * n )
+        if mode != 'contiguous':
+            raise ValueError( "shard mode can be 'contiguous' or 'strided', not %r" % ( mode, ))
+        if self. _length is None:
+            raise ValueError( 'cannot partition an unbound Range, use a strided shard' )
+        length = int( self. _length )
+        return self[ length * i // n:length * ( i + 1 ) // n ]
+
+    # Random sampling
+    #
+    # rng is a random.Random instance, or None for the functions of the random module.
+    # Elements are picked by index so nothing is materialized.
+
+    def _sample_length( self ):
+        if self. _length is None:
+            raise ValueError( 'cannot sample from an unbound Range' )
+        return self. _length
+
+    def choice( self, rng = None ):
+        """
+        Return a random element of self
+        """
+        if rng is None:
+            import random as rng
+        length = self. _sample_length()
+        if length == 0:
+            raise IndexError( 'Cannot choose from an empty Range' )
+        return self. _start + self. _step * rng. randrange( length )
+
+    def sample( self, k, rng = None ):
+        """
+        Return a list of k distinct random elements of self, in random order as
+        random.sample() does, using O(k) time and memory (Floyd's algorithm)
+        """
+        if rng is None:
+            import random as rng
+        length = self. _sample_length()
+        if not 0 <= k <= length:
+            raise ValueError( 'Sample larger than population or is negative' )
+        selected = set()
+        for j in range( length - k, length ):
+            i = rng. randrange( j + 1 )
+            selected. add( j if i in selected else i )
+        indices = list( selected )
+        rng. shuffle( indices )
+        start, step = self. _start, self. _step
+        return [ start + step * i for i in indices ]
+
+    def shuffled( self, seed = None ):
+        """
+        Return a lazy random permutation of self, see Range_permutation
+        """
+        return Range_permutation( self, seed )
+
+    # Materialization
+    #
+    # Elements are computed as start + step * i rather than by accumulating step,
+    # like Range_iterator does, so float Ranges do not drift along the way.
+
+    def _bound_length( self ):
+        if self. _length is None:
+            raise ValueError( 'cannot materialize an unbound Range' )
+        return int( self. _length )
+
+    # Elements i..j-1 of self as an iterable of Python numbers
+    def _values( self, i, j ):
+        start, step = self. _start, self. _step
+        if self. _engine is _IntEngine or self. _engine is _IntUnboundEngine:
+            return range( start + step * i, start + step * j, step )
+        return ( start + step * k for k in range( i, j ))
+
+    # Elements i..j-1 of self as a NumPy array, of the natural dtype when dtype is None
+    def _numpy_values( self, np, i, j, dtype = None ):
+        start, step = self. _start, self. _step
+        kind = None if dtype is None else np. dtype( dtype ). kind
+        if kind is not None and kind in 'iu' and i < j:
+            # raise what array.array does, so that fill_into() fails the same with or without NumPy
+            if not ( hasattr( type( start ), '__index__' ) and hasattr( type( step ), '__index__' )):
+                raise TypeError( '%s object cannot be interpreted as an integer' % ( type( start + step ), ))
+            info, first, last = np. iinfo( dtype ), start + step * i, start + step * ( j - 1 )
+            for value in ( first, last ):
+                if not info. min <= value <= info. max:
+                    raise OverflowError( '%s is out of bounds for %s' % ( value, np. dtype( dtype )))
+        if self. _engine is _IntEngine or self. _engine is _IntUnboundEngine:
+            first, last = start + step * i, start + step * ( j - 1 )
+            if _INT64_MIN <= min( first, last ) and max( first, last ) <= _INT64_MAX:
+                if kind is None or kind in 'iu':
+                    return np. arange( first, start + step * j, step, dtype = dtype )
+                if kind in 'fc':
+                    values = np. arange( i, j, dtype = dtype )
+                    values *= step
+                    values += start
+                    return values
+        elif self. _engine is _FloatEngine and kind in ( None, 'f' ):
+            values = np. arange( i, j, dtype = dtype or np. float64 )
+            values *= step
+            values += start
+            return values
+        return np. array( list( self. _values( i, j )), dtype = object if dtype is None else dtype )
+
+    def to_numpy( self, dtype = None ):
+        """
+        Return the elements of self as a NumPy array
+        int Ranges within int64 and float Ranges are generated vectorized,
+        other Ranges default to an array of dtype object
+        An integer dtype raises OverflowError if an element does not fit it and
+        TypeError if the elements are not ints, rather than wrapping or truncating
+        """
+        return self. _numpy_values( _import_numpy(), 0, self. _bound_length(), dtype )
+
+    def __array__( self, dtype = None, copy = None ):
+        """
+        Return numpy.asarray(self)
+        """
+        if copy is False:
+            raise ValueError( 'a Range cannot be converted to an array without copying' )
+        return self. to_numpy( dtype )
+
+    def to_array( self, typecode ):
+        """
+        Return the elements of self as an array.array of the given typecode
+        """
+        from array import array
+        return array( typecode, self. _values( 0, self. _bound_length()))
+
+    def fill_into( self, buffer ):
+        """
+        Write the leading elements of self into a writable one-dimensional
+        buffer (bytearray, array.array, NumPy array, ...) and return the number
+        of elements written, the smaller of the buffer size and the length of
+        self. An unbound Range fills the whole buffer.
+        """
+        view = memoryview( buffer )
+        if view. readonly:
+            raise TypeError( 'cannot fill a read-only buffer' )
+        if view. ndim != 1:
+            raise ValueError( 'can only fill a one-dimensional buffer' )
+        count = len( view ) if self. _length is None else min( len( view ), int( self. _length ))
+        if 'numpy' in sys. modules:
+            np = sys. modules[ 'numpy' ]
+            out = np. asarray( view )
+            for i in range( 0, count, _FILL_BLOCK ):
+                j = min( i + _FILL_BLOCK, count )
+                out[ i:j ] = self. _numpy_values( np, i, j, out. dtype )
+        else:
+            from array import array
+            typecode = view. format. lstrip( '@' )
+            if len( typecode ) != 1 or typecode not in 'bBhHiIlLqQfd':
+                raise ValueError( 'cannot fill a buffer of format %r' % ( view. format, ))
+            for i in range( 0, count, _FILL_BLOCK ):
+                j = min( i + _FILL_BLOCK, count )
+                view[ i:j ] = array( typecode, self. _values( i, j ))
+        return count
+
 
 # The following iterator class does nothing more than a generator, however
 # it is implemented as a standalone class so that the iterations can be pickeled
 # (generators can't be pickled).
+# Bound Ranges of ints iterate with Python's own range iterator instead. Unbound
+# Ranges of ints still use this class rather than itertools.count, as pickling
+# of itertools objects is deprecated since Python 3.12.
 class Range_iterator:
     """
-    Implement a Range object iterator
+    Range_iterator(start, count, step, position=0) -> Range_iterator object
+
+    Iterate over start + step * i for position <= i < count, endlessly when count is None.
+    The iterator is seekable and picklable, see advance() and remaining_range().
     """
 
-    def __init__( self, current, count, step ):
+    __slots__ = ( '_start', '_count', '_step', '_position' )
+
+    def __init__( self, start, count, step, position = 0 ):
         """
         Initialize the iterator
         """
-        self. current, self. count, self. step = current - step, count, step
+        self. _start, self. _count, self. _step, self. _position = start, count, step, position
 
     def __iter__( self ):
         """
@@ -387,9 +1718,385 @@ class Range_iterator:
         """
         Return next(self)
         """
-        if self. count == 0:
+        position = self. _position
+        if position == self. _count:
             raise StopIteration
-        self. current += self. step
-        if self. count is not None:
-            self. count -= 1
-        return self. current
+        self. _position = position + 1
+        return self. _start + self. _step * position
+
+    def __length_hint__( self ):
+        """
+        Return the number of remaining items, NotImplemented when unbound
+        """
+        return NotImplemented if self. _count is None else int( self. _count - self. _position )
+
+    @property
+    def position( self ):
+        """
+        Return the number of items consumed so far
+        """
+        return self. _position
+
+    @property
+    def remaining( self ):
+        """
+        Return the number of remaining items, None when unbound
+        """
+        return None if self. _count is None else self. _count - self. _position
+
+    def advance( self, n ):
+        """
+        Skip the next n items, or all the remaining ones if there are fewer, in O(1)
+        Return the number of items skipped
+        """
+        n = _normalize( n, 'cannot advance by %s', type( n ))
+        if n < 0:
+            raise ValueError( 'cannot advance by a negative number' )
+        if self. _count is not None:
+            n = min( n, self. _count - self. _position )
+        self. _position += n
+        return n
+
+    def remaining_range( self ):
+        """
+        Return the items that have not been consumed yet as a Range
+        The Range starts at the next item, so it has the very same items only for
+        int and exact Ranges: the items of a float Range are computed from its own
+        start and may differ in the last place. To resume a float iteration exactly,
+        pickle the iterator or call Range.iterator(position) on the original Range.
+        """
+        start = self. _start + self. _step * self. _position
+        if self. _count is None:
+            return Range( start, None, self. _step )
+        stop = self. _start + self. _step * self. _count
+        if type( stop ) is float and self. _position < self. _count:
+            # half a step past the last item, so that rounding cannot add an item
+            stop = self. _start + self. _step * ( self. _count - 1 ) + self. _step / 2
+        return Range( start, stop, self. _step )
+
+    # The next n items as a list
+    def _batch( self, n ):
+        position = self. _position
+        if self. _count is not None:
+            n = int( min( n, self. _count - position ))
+        self. _position = position + n
+        start, step = self. _start, self. _step
+        if type( start ) is int and type( step ) is int:
+            start += step * position
+            return list( range( start, start + step * n, step ))
+        return [ start + step * i for i in range( position, position + n )]
+
+    def __reduce__( self ):
+        """
+        Return a compact representation for pickling
+        """
+        return ( Range_iterator, ( self. _start, self. _count, self. _step, self. _position ))
+
+    # Pickles of the releases before __slots__ hold the instance __dict__ as their state:
+    # the last item returned, the number of remaining items (None when unbound) and the step
+    def __setstate__( self, state ):
+        current, step = state[ 'current' ], state[ 'step' ]
+        self. __init__( current + step, state[ 'count' ], step )
+
+    def __repr__( self ):
+        """
+        Return repr(self)
+        """
+        return 'Range_iterator(%r, %r, %r, %r)' % ( self. _start, self. _count, self. _step, self. _position )
+
+
+class Range_aiterator:
+    """
+    Range_aiterator(iterator, batch=None, yield_every=1024) -> Range_aiterator object
+
+    Asynchronous iterator over the items of a Range_iterator, or over lists of batch items,
+    that suspends every yield_every steps so that other tasks get to run. Its position is
+    the one of the underlying iterator, which may be checkpointed as usual.
+    """
+
+    __slots__ = ( 'iterator', 'batch', 'yield_every', '_countdown' )
+
+    def __init__( self, iterator, batch = None, yield_every = 1024 ):
+        """
+        Initialize the iterator
+        """
+        if batch is not None and batch <= 0 or yield_every <= 0:
+            raise ValueError( 'batch and yield_every must be positive' )
+        self. iterator, self. batch, self. yield_every, self. _countdown = iterator, batch, yield_every, yield_every
+
+    def __aiter__( self ):
+        """
+        Return aiter(self) -> self
+        """
+        return self
+
+    async def __anext__( self ):
+        """
+        Return anext(self)
+        """
+        self. _countdown -= 1
+        if self. _countdown == 0:
+            self. _countdown = self. yield_every
+            await _yield_control()
+        if self. batch is not None:
+            items = self. iterator. _batch( self. batch )
+            if not items:
+                raise StopAsyncIteration
+            return items
+        try:
+            return next( self. iterator )
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def __reduce__( self ):
+        """
+        Return a compact representation for pickling
+        """
+        return ( Range_aiterator, ( self. iterator, self. batch, self. yield_every ))
+
+
+# A random permutation of a bound Range that is never materialized
+#
+# Position i maps to element self[p(i)] where p is a keyed bijection over
+# [0, length): a six-round Feistel network over the smallest even number of
+# bits that covers length, restricted to [0, length) by cycle walking, i.e. by
+# re-applying the network until the result falls in range (less than four times
+# on average). The keys are derived from the seed, so the permutation is
+# reproducible and pickles as just the Range and the seed.
+class Range_permutation:
+    """
+    Range_permutation(Range, seed=None) -> Range_permutation object
+
+    Return a lazy, indexable and picklable random permutation of a bound Range.
+    When seed is None a random seed is picked, see the seed property.
+    """
+
+    __slots__ = ( '_range', '_seed', '_keys', '_bits', '_mask', '_wide' )
+
+    _ROUNDS = 6
+
+    def __init__( self, r, seed = None ):
+        """
+        Initialize the permutation
+        """
+        import random
+        if type( r ) is not Range:
+            r = Range( r )
+        if r. _length is None:
+            raise ValueError( 'cannot shuffle an unbound Range' )
+        if seed is None:
+            seed = random. getrandbits( 64 )
+        half = max( 1, ( int( r. _length ) - 1 ). bit_length() + 1 ) // 2
+        keys, wide = random. Random( seed ), half + 64
+        self. _range, self. _seed, self. _bits, self. _mask, self. _wide = r, seed, half, ( 1 << half ) - 1, ( 1 << wide ) - 1
+        self. _keys = tuple(( keys. getrandbits( wide ) | 1, keys. getrandbits( wide )) for i in range( self. _ROUNDS ))
+
+    def __reduce__( self ):
+        return ( Range_permutation, ( self. _range, self. _seed ))
+
+    @property
+    def range( self ): return self. _range
+
+    @property
+    def seed( self ): return self. _seed
+
+    @property
+    def length( self ): return self. _range. _length
+
+    def __len__( self ):
+        """
+        Return len(self)
+        """
+        return len( self. _range )
+
+    # The round function is a keyed multiply-shift hash, the top bits of a*x+b
+    # modulo 2**(bits+64); the Feistel structure makes the network a bijection
+    # whatever the round function is
+    def _mix( self, value, key ):
+        return (( key[ 0 ] * value + key[ 1 ]) & self. _wide ) >> 64
+
+    def _permute( self, index ):
+        bits, mask, length = self. _bits, self. _mask, self. _range. _length
+        while True:
+            left, right = index >> bits, index & mask
+            for key in self. _keys:
+                left, right = right, left ^ self. _mix( right, key )
+            index = ( left << bits ) | right
+            if index < length:
+                return index
+
+    def _unpermute( self, index ):
+        bits, mask, length = self. _bits, self. _mask, self. _range. _length
+        while True:
+            left, right = index >> bits, index & mask
+            for key in reversed( self. _keys ):
+                left, right = right ^ self. _mix( left, key ), left
+            index = ( left << bits ) | right
+            if index < length:
+                return index
+
+    def __getitem__( self, key ):
+        """
+        Return self[key]
+        """
+        length = self. _range. _length
+        key = operator. index( key )
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError( 'Range_permutation index out of range' )
+        r = self. _range
+        return r. _start + r. _step * self. _permute( key )
+
+    def __iter__( self ):
+        """
+        Return iter(self)
+        """
+        r = self. _range
+        start, step, permute = r. _start, r. _step, self. _permute
+        return ( start + step * permute( i ) for i in range( int( r. _length )))
+
+    def __contains__( self, value ):
+        """
+        Return value in self
+        """
+        return value in self. _range
+
+    def index( self, value ):
+        """
+        Return the position of value in self
+        """
+        return self. _unpermute( self. _range. index( value ))
+
+    def __repr__( self ):
+        """
+        Return repr(self)
+        """
+        return 'Range_permutation(%r, %r)' % ( self. _range, self. _seed )
+
+
+# The terms of the intersection of progressions with positive steps step0 and
+# step1 by the Chinese Remainder Theorem: gcd(step0, step1), the interval
+# step1 // gcd, the inverse of step0 // gcd modulo that interval and the step of
+# the intersection, lcm(step0, step1). Cached, as intersections tend to repeat
+# the same few steps.
+@functools. lru_cache( maxsize = 1024 )
+def _crt_terms( step0, step1 ):
+    gcd, x, y = _egcd( step0, step1 )
+    interval1 = step1 // gcd
+    return gcd, interval1, x % interval1, step0 * interval1
+
+# The first element, step and last element (None when unbound) of an int Range
+# or a range, () if it is empty and None if it is neither
+def _progression( r ):
+    if type( r ) is Range:
+        if r. _engine is not _IntEngine and r. _engine is not _IntUnboundEngine:
+            return None
+        return () if r. _length == 0 else ( r. _start, r. _step, r. _last_item )
+    if type( r ) is range:
+        return ( r. start, r. step, r[ -1 ] ) if r else ()
+    return None
+
+# The elements common to two int progressions, given as by _progression(), as the
+# least and the greatest of them (None when there is no bound) and their positive
+# step, or None if there are none. They are the elements between the larger lower
+# bound and the smaller upper bound that solve the two congruences.
+def _int_common( start0, step0, last0, start1, step1, last1 ):
+    lo0, hi0 = ( start0, last0 ) if step0 > 0 else ( last0, start0 )
+    lo1, hi1 = ( start1, last1 ) if step1 > 0 else ( last1, start1 )
+    lo, hi = _stop_max_inv( lo0, lo1 ), _stop_min( hi0, hi1 )
+    if lo is not None and hi is not None and lo > hi:
+        return None
+    gcd, interval1, inverse, lcm = _crt_terms( abs( step0 ), abs( step1 ))
+    offset = start1 - start0
+    if offset % gcd:
+        return None
+    common = start0 + abs( step0 ) * ( offset // gcd * inverse % interval1 )
+    if lo is not None:
+        lo += ( common - lo ) % lcm
+    if hi is not None:
+        hi -= ( hi - common ) % lcm
+        if lo is not None and lo > hi:
+            return None
+    return lo, hi, lcm
+
+# True if value is an element of a non-empty int progression
+def _int_has( start, step, last, value ):
+    if step > 0:
+        inside = start <= value and ( last is None or value <= last )
+    else:
+        inside = start >= value and ( last is None or value >= last )
+    return inside and ( value - start ) % step == 0
+
+# True if the non-empty int progression 0 is included in the non-empty int
+# progression 1: both of its ends are in 1 (or both are unbound in the same
+# direction), and its step is a multiple of that of 1 unless it has one element
+def _int_subset( start0, step0, last0, start1, step1, last1 ):
+    if last0 is None:
+        if last1 is not None or ( step0 > 0 ) != ( step1 > 0 ):
+            return False
+    elif not _int_has( start1, step1, last1, last0 ):
+        return False
+    return ( start0 == last0 or step0 % step1 == 0 ) and _int_has( start1, step1, last1, start0 )
+
+# A Range compiled for intersecting with many others
+#
+# Ranges of ints are intersected by _int_common(), with the terms of the pair of
+# steps from the cache of _crt_terms(), and the result has the direction of the
+# compiled Range. Other intersections are computed by Range.__and__.
+class Range_intersector:
+    """
+    Range_intersector(Range) -> Range_intersector object
+
+    Return an object that computes the intersection of a Range with other Ranges,
+    equal to Range & other, without recomputing what depends only on the Range.
+    """
+
+    __slots__ = ( '_range', '_terms', '_empty' )
+
+    def __init__( self, r ):
+        """
+        Initialize the intersector
+        """
+        if type( r ) is not Range:
+            r = Range( r )
+        self. _range, self. _terms, self. _empty = r, _progression( r ), Range( r. _start, r. _start, r. _step )
+
+    def __reduce__( self ):
+        return ( Range_intersector, ( self. _range, ))
+
+    @property
+    def range( self ): return self. _range
+
+    def intersect( self, other ):
+        """
+        Return Range & other
+        """
+        terms = self. _terms
+        other_terms = _progression( other )
+        if terms is None or other_terms is None:
+            return self. _range & other
+        if not terms or not other_terms:
+            return self. _empty
+        common = _int_common( *terms, *other_terms )
+        if common is None:
+            return self. _empty
+        lo, hi, step = common
+        if terms[ 1 ] > 0:
+            return Range( lo, None if hi is None else hi + step, step )
+        return Range( hi, None if lo is None else lo - step, -step )
+
+    __call__ = intersect
+
+    def intersect_many( self, others ):
+        """
+        Return the list of Range & other for each other in others
+        """
+        intersect = self. intersect
+        return [ intersect( other ) for other in others ]
+
+    def __repr__( self ):
+        """
+        Return repr(self)
+        """
+        return 'Range_intersector(%r)' % ( self. _range, )
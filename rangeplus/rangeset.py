@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#    rangeplus - Extended Python Range Class
+#    Copyright (c) 2016 Avner Herskovits
+#
+#    MIT License
+#
+#    Permission  is  hereby granted, free of charge, to any person  obtaining  a
+#    copy of this  software and associated documentation files (the "Software"),
+#    to deal in the Software  without  restriction, including without limitation
+#    the rights to use, copy, modify, merge,  publish,  distribute,  sublicense,
+#    and/or  sell  copies of  the  Software,  and to permit persons to whom  the
+#    Software is furnished to do so, subject to the following conditions:
+#
+#    The above copyright notice and this  permission notice shall be included in
+#    all copies or substantial portions of the Software.
+#
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT  WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE  WARRANTIES  OF  MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR  ANY  CLAIM,  DAMAGES  OR  OTHER
+#    LIABILITY, WHETHER IN AN  ACTION  OF  CONTRACT,  TORT OR OTHERWISE, ARISING
+#    FROM,  OUT  OF  OR  IN  CONNECTION WITH THE SOFTWARE OR THE  USE  OR  OTHER
+#    DEALINGS IN THE SOFTWARE.
+#
+
+
+# RangeSet is a set of ints kept as a sorted union of disjoint ascending Ranges,
+# with the set operations of Python sets and logarithmic membership tests.
+
+import operator
+from bisect import bisect_left, bisect_right
+from heapq import heappop, heappush, merge
+from itertools import accumulate
+from .rangeplus import Range, _IntEngine
+
+# Return r as an ascending bound int Range, or None if it is empty
+def _ascending( r ):
+    if type( r ) is not Range:
+        r = Range( r )
+    if r. _engine is not _IntEngine:
+        raise ValueError( 'RangeSet holds bound int Ranges only, got %r' % ( r, ))
+    if r. _length == 0:
+        return None
+    if r. _length == 1:
+        return Range( r. _start, r. _start + 1 )
+    return r if r. _step > 0 else r[ ::-1 ]
+
+_first = lambda r: r. _start
+_last = lambda r: r. _last_item
+_overlap = lambda a, b: a. _start <= b. _last_item and b. _start <= a. _last_item
+
+# Number of elements of the ascending Range r that are smaller than value
+def _below( r, value ):
+    return 0 if value <= r. _start else min( r. _length, ( value - r. _start - 1 ) // r. _step + 1 )
+
+# Return the elements of r that are not in s as a list of ascending Ranges
+#
+# The elements of r between the first and the last common element are either
+# the runs between consecutive common elements, or the residue classes of r
+# modulo the step of the intersection other than the common one; whichever
+# takes fewer Ranges is used.
+def _subtract( r, s ):
+    common = r & s
+    if common. _length == 0:
+        return [ r ]
+    first, last, step = common. _start, common. _last_item, r. _step
+    pieces = [ Range( r. _start, first, step )] if r. _start < first else []
+    if common. _length > 1:
+        period = common. _step
+        if common. _length - 1 <= period // step - 1:
+            pieces += [ Range( value + step, value + period, step ) for value in range( first, last, period )]
+        else:
+            pieces += [ Range( first + k * step, last, period ) for k in range( 1, period // step )]
+    if last < r. _last_item:
+        pieces. append( Range( last + step, r. _stop, step ))
+    return pieces
+
+# Return the union of two disjoint ascending Ranges as a single Range, or None
+def _join( p, q ):
+    if q. _start < p. _start:
+        p, q = q, p
+    if p. _last_item < q. _start:
+        if p. _length == 1 and q. _length == 1:
+            return Range( p. _start, q. _start + 1, q. _start - p. _start )
+        if ( q. _length == 1 or q. _step == p. _step ) and p. _length > 1 and q. _start == p. _last_item + p. _step:
+            return Range( p. _start, q. _last_item + 1, p. _step )
+        if p. _length == 1 and q. _start - p. _start == q. _step:
+            return Range( p. _start, q. _last_item + 1, q. _step )
+    # interleaved progressions that complete each other, e.g. evens and odds
+    elif p. _step == q. _step and p. _step % 2 == 0 and q. _start - p. _start == p. _step // 2 \
+            and p. _length - 1 <= q. _length <= p. _length:
+        return Range( p. _start, max( p. _last_item, q. _last_item ) + 1, p. _step // 2 )
+    return None
+
+# Sort a list of pairwise disjoint ascending Ranges and merge those that join
+def _normalize( pieces ):
+    result = []
+    for piece in sorted( pieces, key = _first ):
+        while result:
+            joined = _join( result[ -1 ], piece )
+            if joined is None:
+                break
+            result. pop()
+            piece = joined
+        result. append( piece )
+    return result
+
+
+class RangeSet:
+    """
+    RangeSet(iterable) -> RangeSet object
+
+    Return the set of all the elements of an iterable of bound int Range or
+    range objects, kept as a sorted union of disjoint ascending Ranges.
+    Supports |, &, - and ^ with RangeSet, Range and range operands.
+    Membership and index take O(log k) for k Ranges as long as the spans of
+    the Ranges do not interleave, which only happens when progressions of
+    incompatible steps are combined.
+    """
+
+    __slots__ = ( '_ranges', '_firsts', '_lasts', '_offsets' )
+
+    def __init__( self, ranges = ()):
+        """
+        Initialize self
+        """
+        self. _init( _disjoint( r for r in map( _ascending, ranges ) if r is not None ))
+
+    def _init( self, pieces ):
+        pieces = _normalize( pieces )
+        self. _ranges = tuple( pieces )
+        self. _firsts = [ r. _start for r in pieces ]
+        # the running maximum of the last elements, and the running count of elements
+        self. _lasts = list( accumulate(( r. _last_item for r in pieces ), max ))
+        self. _offsets = [ 0 ] + list( accumulate( r. _length for r in pieces ))
+
+    @classmethod
+    def _from_pieces( cls, pieces ):
+        self = cls. __new__( cls )
+        self. _init( pieces )
+        return self
+
+    @property
+    def ranges( self ):
+        """
+        The disjoint ascending Ranges that make up self, sorted by first element
+        """
+        return self. _ranges
+
+    @property
+    def length( self ): return self. _offsets[ -1 ]
+
+    def __len__( self ):
+        """
+        Return len(self)
+        """
+        return self. _offsets[ -1 ]
+
+    def __bool__( self ):
+        """
+        Return bool(self)
+        """
+        return bool( self. _ranges )
+
+    def __iter__( self ):
+        """
+        Return iter(self), the elements in ascending order
+        """
+        return iter( self. _ranges[ 0 ]) if len( self. _ranges ) == 1 else merge( *self. _ranges )
+
+    def __repr__( self ):
+        """
+        Return repr(self)
+        """
+        return 'RangeSet([%s])' % ( ', '. join( map( repr, self. _ranges )), )
+
+    # The Ranges that may hold value are the ones in self._ranges[lo:hi]
+    def _candidates( self, value ):
+        return bisect_left( self. _lasts, value ), bisect_right( self. _firsts, value )
+
+    def __contains__( self, value ):
+        """
+        Return value in self
+        """
+        value = _integral( value )
+        if value is None:
+            return False
+        lo, hi = self. _candidates( value )
+        return any( value in r for r in self. _ranges[ lo:hi ])
+
+    def count( self, value ):
+        """
+        Return the number of occurrences of value in self
+        """
+        return 1 if value in self else 0
+
+    def index( self, value ):
+        """
+        Return the index of value in the ascending order of self
+        """
+        integral = _integral( value )
+        if integral is not None:
+            lo, hi = self. _candidates( integral )
+            pieces = self. _ranges[ lo:hi ]
+            if any( integral in r for r in pieces ):
+                return self. _offsets[ lo ] + sum( _below( r, integral ) for r in pieces )
+        raise ValueError( '%s is not in RangeSet' % ( value, ))
+
+    def __eq__( self, other ):
+        """
+        Return self==other
+        """
+        other = _operand( other )
+        if other is None:
+            return NotImplemented
+        return self. _ranges == other. _ranges or \
+            ( self. length == other. length and not _difference( self. _ranges, other. _ranges ))
+
+    def __ne__( self, other ):
+        """
+        Return self!=other
+        """
+        result = self. __eq__( other )
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __or__( self, other ):
+        """
+        Return self|other
+        """
+        other = _operand( other )
+        if other is None:
+            return NotImplemented
+        return RangeSet. _from_pieces( _union( self. _ranges, other. _ranges ))
+
+    def __and__( self, other ):
+        """
+        Return self&other
+        Pairs of Ranges are intersected by Range.__and__
+        """
+        other = _operand( other )
+        if other is None:
+            return NotImplemented
+        others, firsts, lasts = _span_index( other. _ranges )
+        pieces = ( a & b for a in self. _ranges for b in others[ bisect_left( lasts, a. _start ) : bisect_right( firsts, a. _last_item )]
+            if _overlap( a, b ))
+        return RangeSet. _from_pieces([ r for r in map( _ascending, pieces ) if r is not None ])
+
+    def __sub__( self, other ):
+        """
+        Return self-other
+        """
+        other = _operand( other )
+        if other is None:
+            return NotImplemented
+        return RangeSet. _from_pieces( _difference( self. _ranges, other. _ranges ))
+
+    def __xor__( self, other ):
+        """
+        Return self^other
+        """
+        other = _operand( other )
+        if other is None:
+            return NotImplemented
+        return RangeSet. _from_pieces( _difference( self. _ranges, other. _ranges ) + _difference( other. _ranges, self. _ranges ))
+
+    __ror__, __rand__, __rxor__ = __or__, __and__, __xor__
+
+    def __rsub__( self, other ):
+        """
+        Return other-self
+        """
+        other = _operand( other )
+        if other is None:
+            return NotImplemented
+        return other - self
+
+
+# Sort disjoint ascending Ranges by first element, and return them along with their
+# first elements and the running maximum of their last elements, so that the ones
+# whose spans may overlap [lo, hi] are pieces[bisect_left(lasts, lo):bisect_right(firsts, hi)]
+def _span_index( pieces ):
+    pieces = sorted( pieces, key = _first )
+    return pieces, [ r. _start for r in pieces ], list( accumulate(( r. _last_item for r in pieces ), max ))
+
+# Return the elements of the pieces that are not in any of the others
+def _difference( pieces, others ):
+    others, firsts, lasts = _span_index( others )
+    result = []
+    for piece in pieces:
+        rest = [ piece ]
+        for other in others[ bisect_left( lasts, piece. _start ) : bisect_right( firsts, piece. _last_item )]:
+            if _overlap( piece, other ):
+                rest = [ r for p in rest for r in _subtract( p, other )]
+        result += rest
+    return result
+
+# Return the elements of ascending Ranges as disjoint ascending Ranges. The Ranges
+# are swept by first element, and each one is reduced by the pieces kept so far
+# that reach it, which are held in a heap by last element until they are passed.
+def _disjoint( ranges ):
+    result, active = [], []
+    for r in sorted( ranges, key = _first ):
+        while active and active[ 0 ][ 0 ] < r. _start:
+            heappop( active )
+        rest = [ r ]
+        for last, n, piece in active:
+            if _overlap( r, piece ):
+                rest = [ q for p in rest for q in _subtract( p, piece )]
+        for piece in rest:
+            heappush( active, ( piece. _last_item, len( result ), piece ))
+            result. append( piece )
+    return result
+
+def _union( pieces, others ):
+    return list( pieces ) + _difference( others, pieces )
+
+# Return a RangeSet operand as a RangeSet, None if not supported
+def _operand( other ):
+    if type( other ) is RangeSet:
+        return other
+    if type( other ) is Range or type( other ) is range:
+        r = _ascending( other )
+        return RangeSet. _from_pieces([] if r is None else [ r ])
+    return None
+
+# Return value as an int if it is integral, None otherwise
+def _integral( value ):
+    if type( value ) is int:
+        return value
+    try:
+        return operator. index( value )
+    except TypeError:
+        try:
+            return int( value ) if value == int( value ) else None
+        except ( TypeError, ValueError, OverflowError ):
+            return None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+#    rangeplus - Extended Python Range Class
+#    Copyright (c) 2016 Avner Herskovits
+#
+#    MIT License
+#
+#    Permission  is  hereby granted, free of charge, to any person  obtaining  a
+#    copy of this  software and associated documentation files (the "Software"),
+#    to deal in the Software  without  restriction, including without limitation
+#    the rights to use, copy, modify, merge,  publish,  distribute,  sublicense,
+#    and/or  sell  copies of  the  Software,  and to permit persons to whom  the
+#    Software is furnished to do so, subject to the following conditions:
+#
+#    The above copyright notice and this  permission notice shall be included in
+#    all copies or substantial portions of the Software.
+#
+#    THE SOFTWARE IS PROVIDED "AS IS", WITHOUT  WARRANTY OF ANY KIND, EXPRESS OR
+#    IMPLIED, INCLUDING BUT NOT LIMITED TO THE  WARRANTIES  OF  MERCHANTABILITY,
+#    FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#    AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR  ANY  CLAIM,  DAMAGES  OR  OTHER
+#    LIABILITY, WHETHER IN AN  ACTION  OF  CONTRACT,  TORT OR OTHERWISE, ARISING
+#    FROM,  OUT  OF  OR  IN  CONNECTION WITH THE SOFTWARE OR THE  USE  OR  OTHER
+#    DEALINGS IN THE SOFTWARE.
+#
+
+
+# Opt-in instrumentation of Range
+#
+# enable() replaces the instrumented methods of Range with wrappers that count
+# every call by method and by path: 'arithmetic' when the result is computed,
+# 'linear' when a value that is not calculateable falls back to a linear search,
+# and 'error' when the call raises. Timing histograms (by powers of two of
+# nanoseconds) are optional, and the callers that hit the linear fallback are
+# recorded by file and line. disable() puts the original methods back, so the
+# instrumentation costs nothing while disabled. Only the outermost call is
+# recorded, calls made by Range methods on behalf of the caller are not.
+
+import functools, sys, threading, time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from .rangeplus import Range, _calculateable
+
+_METHODS = ( '__contains__', 'count', 'index', '__getitem__', '__iter__', '__reversed__', '__and__' )
+_LOOKUPS = ( '__contains__', 'count', 'index' )
+
+_lock, _local = threading. Lock(), threading. local()
+_originals = {}
+_calls, _histograms, _callers = Counter(), defaultdict( Counter ), Counter()
+_timing = False
+
+# The path that a lookup of value takes, except for errors
+def _path( value ):
+    if type( value ) is complex and value. imag == 0:
+        value = value. real
+    return 'linear' if not _calculateable( value ) and hasattr( value, '__eq__' ) else 'arithmetic'
+
+def _instrument( method, original ):
+    lookup = method in _LOOKUPS
+    @functools. wraps( original )
+    def wrapper( self, *args, **kwargs ):
+        if getattr( _local, 'busy', False ):
+            return original( self, *args, **kwargs )
+        path = _path( args[ 0 ]) if lookup and args else 'arithmetic'
+        caller = sys. _getframe( 1 ) if path == 'linear' else None
+        start = time. perf_counter_ns() if _timing else 0
+        _local. busy = True
+        try:
+            return original( self, *args, **kwargs )
+        except Exception:
+            path = 'error'
+            raise
+        finally:
+            _local. busy = False
+            elapsed = time. perf_counter_ns() - start if _timing else 0
+            with _lock:
+                _calls[ method, path ] += 1
+                if _timing:
+                    _histograms[ method, path ][ 1 << elapsed. bit_length() ] += 1
+                if path == 'linear':
+                    _callers[ '%s:%d' % ( caller. f_code. co_filename, caller. f_lineno )] += 1
+    return wrapper
+
+def enable( timing = False ):
+    """
+    Start recording the calls of Range methods, with timing histograms if timing is true
+    """
+    global _timing
+    with _lock:
+        _timing = timing
+        for method in _METHODS:
+            if method not in _originals:
+                _originals[ method ] = Range. __dict__[ method ]
+                setattr( Range, method, _instrument( method, _originals[ method ]))
+
+def disable():
+    """
+    Stop recording, the Range methods are restored and run at full speed
+    """
+    with _lock:
+        for method, original in _originals. items():
+            setattr( Range, method, original )
+        _originals. clear()
+
+def enabled():
+    """
+    Return True if recording
+    """
+    return bool( _originals )
+
+def reset():
+    """
+    Clear the recorded statistics
+    """
+    with _lock:
+        _calls. clear()
+        _histograms. clear()
+        _callers. clear()
+
+def snapshot():
+    """
+    Return the recorded statistics as a dict of
+    'calls': { method: { path: count }},
+    'timing': { method: { path: { upper bound in nanoseconds: count }}} and
+    'linear_callers': { 'file:line': count }
+    """
+    with _lock:
+        calls, timing = defaultdict( dict ), defaultdict( dict )
+        for ( method, path ), count in _calls. items():
+            calls[ method ][ path ] = count
+        for ( method, path ), histogram in _histograms. items():
+            timing[ method ][ path ] = dict( sorted( histogram. items()))
+        return { 'calls': dict( calls ), 'timing': dict( timing ), 'linear_callers': dict( _callers ) }
+
+@contextmanager
+def recording( timing = False ):
+    """
+    Record the statistics of the calls made in a with block, yielding the snapshot
+    function; recording is restored to its former state on exit
+    """
+    was_enabled = enabled()
+    enable( timing )
+    try:
+        yield snapshot
+    finally:
+        if not was_enabled:
+            disable()
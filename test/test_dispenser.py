@@ -0,0 +1,69 @@
+# Tests for RangeDispenser
+
+import sys, time, threading, unittest
+sys. path. insert( 0, '..' )
+from rangeplus import Range, RangeDispenser
+
+def consume( dispenser, workers, work = lambda value: None ):
+    taken, lock = [], threading. Lock()
+    def worker():
+        for chunk in dispenser:
+            for value in chunk:
+                work( value )
+            with lock:
+                taken. extend( chunk )
+    threads = [ threading. Thread( target = worker ) for i in range( workers )]
+    for thread in threads:
+        thread. start()
+    for thread in threads:
+        thread. join()
+    return taken
+
+class RangeDispenserTest(unittest.TestCase):
+
+    def test_threads( self ):
+        for case in (( 10000, ), ( 10000, 0, -7 ), ( 0, ), ( 1, ), ( 2**70, 2**70 + 5000, 3 )):
+            r = Range( *case )
+            for workers, chunk_size in (( 1, 1 ), ( 4, 16 ), ( 8, 1000 )):
+                dispenser = RangeDispenser( r, chunk_size, workers )
+                self. assertEqual( sorted( consume( dispenser, workers )), sorted( r ))
+                self. assertEqual( dispenser. checkpoint(), [])
+                self. assertEqual( dispenser. remaining, 0 )
+                self. assertFalse( dispenser. take())
+
+    def test_stealing( self ):
+        # all the slow elements are in the first slot, the other threads must steal them
+        dispenser = RangeDispenser( Range( 400 ), 10, 4 )
+        taken = consume( dispenser, 4, lambda value: value < 100 and time. sleep( 0.001 ))
+        self. assertEqual( sorted( taken ), list( range( 400 )))
+        dispenser = RangeDispenser( Range( 100 ), 10, 2 )
+        while dispenser. take( 1 ):
+            pass
+        self. assertEqual( dispenser. remaining, 0 )
+
+    def test_checkpoint( self ):
+        r = Range( 5, 5000, 3 )
+        dispenser = RangeDispenser( r, 50, 3 )
+        first, second = dispenser. take( 0 ), dispenser. take( 1 )
+        dispenser. done( first )
+        self. assertRaises( ValueError, dispenser. done, first )
+        checkpoint = dispenser. checkpoint()
+        self. assertIn( second, checkpoint )
+        self. assertEqual( sorted( value for part in checkpoint for value in part ), sorted( set( r ) - set( first )))
+        self. assertEqual( dispenser. remaining, r. length - 100 )
+        resumed = RangeDispenser( checkpoint, 50, 2 )
+        self. assertEqual( sorted( consume( resumed, 2 )), sorted( set( r ) - set( first )))
+
+    def test_unbound( self ):
+        dispenser = RangeDispenser( Range( 7, None, -2 ), 4, 2 )
+        chunks = [ dispenser. take( 0 ), dispenser. take( 1 ), dispenser. take( 0 )]
+        self. assertEqual( chunks, [ Range( 7, -9, -4 ), Range( 5, -11, -4 ), Range( -9, -25, -4 )])
+        self. assertIsNone( dispenser. remaining )
+        checkpoint = dispenser. checkpoint()
+        self. assertIn( Range( -25, None, -4 ), checkpoint )
+        self. assertRaises( IndexError, dispenser. take, 2 )
+        self. assertRaises( ValueError, RangeDispenser, Range( 10 ), 0 )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,11 @@ import sys, unittest
 sys. path. insert( 0, '..' )
 from rangeplus import Range
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 class RangeTest(unittest.TestCase):
 
     # The following test verifies the compatibility of indexing/slicing operations between Range and range
@@ -214,6 +219,620 @@ class RangeTest(unittest.TestCase):
                 result = Range( first, last( r0, r1 ) + fix_stop(), second - first )
         self. assertEqual( result, r0 & r1 )
 
+    # The int engines must agree with the generic duck-typed implementation
+    def test_int_engines( self ):
+        from rangeplus. rangeplus import _Engine
+        range_cases = (( 10, ), ( -10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 10, 50, -3 ), ( 0, 0, 1 ),
+            ( 2**70, 2**70 + 40, 7 ), ( None, ), ( 10, None, 7 ), ( 10, None, -7 ))
+        for case in range_cases:
+            r = Range( *case )
+            for value in range( -60, 60 ):
+                self. assertEqual( r. __contains__( value ), _Engine. contains( r, value ))
+                self. assertEqual( r. count( value ), _Engine. count( r, value ))
+                if value in r:
+                    self. assertEqual( r. index( value ), _Engine. index( r, value ))
+                else:
+                    self. assertRaises( ValueError, r. index, value )
+                try:
+                    expect = _Engine. getitem( r, value )
+                except IndexError:
+                    self. assertRaises( IndexError, r. __getitem__, value )
+                else:
+                    self. assertEqual( r[ value ], expect )
+
+    def test_immutable( self ):
+        r = Range( 10, 200, 13 )
+        self. assertFalse( hasattr( r, '__dict__' ))
+        self. assertRaises( AttributeError, setattr, r, '_start', 0 )
+        self. assertRaises( AttributeError, setattr, r, 'spam', 0 )
+        self. assertRaises( AttributeError, delattr, r, '_stop' )
+        self. assertEqual( hash( r ), hash( r ))
+        self. assertEqual( hash( r ), hash( Range( 10, 199, 13 )))
+        self. assertEqual( list( reversed( r )), list( reversed( range( 10, 200, 13 ))))
+        self. assertFalse( hasattr( iter( r ), '__dict__' ))
+
+    # Pickles written by the releases before __slots__, which pickled the instance __dict__
+    def test_legacy_pickle( self ):
+        import pickle
+        legacy = (
+            b'ccopy_reg\n_reconstructor\np0\n(crangeplus.rangeplus\nRange\np1\nc__builtin__\nobject\np2\nNtp3\nRp4\n(dp5\n'
+            b'V_start\np6\nI2\nsV_stop\np7\nI50\nsV_step\np8\nI3\nsV_length\np9\nI16\nsb.',
+            b'\x80\x04\x95T\x00\x00\x00\x00\x00\x00\x00\x8c\x13rangeplus.rangeplus\x94\x8c\x05Range\x94\x93\x94)\x81\x94}\x94('
+            b'\x8c\x06_start\x94K\x02\x8c\x05_stop\x94K2\x8c\x05_step\x94K\x03\x8c\x07_length\x94K\x10ub.' )
+        for data in legacy:
+            r = pickle. loads( data )
+            self. assertEqual(( r. args, r. length ), (( 2, 50, 3 ), 16 ))
+            self. assertEqual( list( r ), list( range( 2, 50, 3 )))
+            self. assertEqual( hash( r ), hash( Range( 2, 50, 3 )))
+        r = pickle. loads( b'ccopy_reg\n_reconstructor\np0\n(crangeplus.rangeplus\nRange\np1\nc__builtin__\nobject\np2\nNtp3\nRp4\n(dp5\n'
+            b'V_start\np6\nI2\nsV_stop\np7\nNsV_step\np8\nI-3\nsV_length\np9\nNsb.' )
+        self. assertEqual( r, Range( 2, None, -3 ))
+        # iter( Range( 5, None, 3 )) after two items, and a fresh iter( Range( 10 ))
+        it = pickle. loads( b'ccopy_reg\n_reconstructor\np0\n(crangeplus.rangeplus\nRange_iterator\np1\nc__builtin__\nobject\np2\nNtp3\nRp4\n'
+            b'(dp5\nVcurrent\np6\nI8\nsVcount\np7\nNsVstep\np8\nI3\nsb.' )
+        self. assertEqual([ next( it ) for i in range( 3 )], [ 11, 14, 17 ])
+        it = pickle. loads( b'ccopy_reg\n_reconstructor\np0\n(crangeplus.rangeplus\nRange_iterator\np1\nc__builtin__\nobject\np2\nNtp3\nRp4\n'
+            b'(dp5\nVcurrent\np6\nI-1\nsVcount\np7\nI10\nsVstep\np8\nI1\nsb.' )
+        self. assertEqual( list( it ), list( range( 10 )))
+
+    def test_iterator_speedup( self ):
+        import operator, pickle
+        cases = (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 0, 0, 1 ), ( 2**70, 2**70 + 40, 7 ))
+        for case in cases:
+            r, expect = Range( *case ), range( *case )
+            for it, data in (( iter( r ), list( expect )), ( reversed( r ), list( reversed( expect )))):
+                self. assertEqual( operator. length_hint( it ), len( data ))
+                self. assertEqual( list( pickle. loads( pickle. dumps( it ))), data )
+                self. assertEqual( list( it ), data )
+        for case in (( 1.0, 5.0, 1.0 ), ( 10, None, 7 )):
+            it = iter( Range( *case ))
+            self. assertEqual( type( it ). __name__, 'Range_iterator' )
+            next( it )
+            self. assertEqual( operator. length_hint( it, -1 ), 3 if case[ 1 ] is not None else -1 )
+
+    def test_iterator_seek( self ):
+        import pickle
+        from fractions import Fraction
+        for case in (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 0, ), ( 2**70, 2**70 + 40, 7 ), ( Fraction( 1, 3 ), Fraction( 13, 3 ), 1 )):
+            r = Range( *case )
+            data = list( r )
+            for position in range( len( data ) + 2 ):
+                it = r. iterator( position )
+                self. assertEqual( it. position, min( position, len( data )))
+                self. assertEqual( it. remaining, max( 0, len( data ) - position ))
+                self. assertEqual( list( it. remaining_range()), data[ position: ])
+                self. assertEqual( list( pickle. loads( pickle. dumps( it ))), data[ position: ])
+                self. assertEqual( list( it ), data[ position: ])
+                self. assertEqual( it. remaining_range(). length, 0 )
+        it = Range( 7, None, -2 ). iterator()
+        self. assertEqual( it. advance( 5 * 10**9 ), 5 * 10**9 )
+        self. assertEqual( next( it ), 7 - 10**10 )
+        self. assertEqual(( it. position, it. remaining ), ( 5 * 10**9 + 1, None ))
+        self. assertEqual( it. remaining_range(), Range( 5 - 10**10, None, -2 ))
+        it = Range( 10, 20 ). iterator()
+        self. assertEqual( it. advance( 100 ), 10 )
+        self. assertRaises( StopIteration, next, it )
+        self. assertRaises( ValueError, it. advance, -1 )
+        self. assertLess( len( pickle. dumps( Range( 2**70 ). iterator( 2**69 ))), 100 )
+        # float items are exact from the iterator and its position, close from remaining_range()
+        r = Range( 0.0, 1.0, 0.1 )
+        data = list( r )
+        it = r. iterator()
+        it. advance( 3 )
+        self. assertEqual( list( pickle. loads( pickle. dumps( it ))), data[ 3: ])
+        self. assertEqual( list( r. iterator( it. position )), data[ 3: ])
+        remaining = list( it. remaining_range())
+        self. assertEqual( len( remaining ), len( data ) - 3 )
+        for item, expect in zip( remaining, data[ 3: ]):
+            self. assertAlmostEqual( item, expect, places = 12 )
+        self. assertEqual( list( it ), data[ 3: ])
+
+    def test_async( self ):
+        import asyncio, pickle
+        ticks = []
+        async def ticker():
+            while True:
+                ticks. append( len( ticks ))
+                await asyncio. sleep( 0 )
+        async def collect( iterable ):
+            task = asyncio. ensure_future( ticker())
+            await asyncio. sleep( 0 )
+            items = [ item async for item in iterable ]
+            task. cancel()
+            return items
+        r = Range( 5, 500, 3 )
+        self. assertEqual( asyncio. run( collect( r )), list( r ))
+        del ticks[ : ]
+        self. assertEqual( asyncio. run( collect( r. aiter( yield_every = 10 ))), list( r ))
+        self. assertGreaterEqual( len( ticks ), r. length // 10 )
+        batches = asyncio. run( collect( r. abatches( 40 )))
+        self. assertEqual( batches, [ list( r )[ i:i + 40 ] for i in range( 0, r. length, 40 )])
+        self. assertEqual( asyncio. run( collect( Range( 0.5, 6.5, 1.5 ). aiter( 3 ))), [[ 0.5, 2.0, 3.5 ], [ 5.0 ]])
+        # checkpoint the async iterator through its underlying Range_iterator
+        async def take( iterable, n ):
+            return [ await iterable. __anext__() for i in range( n )]
+        it = Range( 10, None, 7 ). aiter()
+        self. assertEqual( asyncio. run( take( it, 3 )), [ 10, 17, 24 ])
+        self. assertEqual( it. iterator. remaining_range(), Range( 31, None, 7 ))
+        self. assertEqual( asyncio. run( take( pickle. loads( pickle. dumps( it )), 2 )), [ 31, 38 ])
+        self. assertRaises( ValueError, r. abatches, 0 )
+
+    def test_exact( self ):
+        from decimal import Decimal
+        from fractions import Fraction
+        cases = (
+            ( Fraction( 1, 3 ), Fraction( 5, 2 ), Fraction( 1, 6 )), ( Fraction( 5, 2 ), Fraction( -1, 3 ), Fraction( -2, 7 )),
+            ( Fraction( 1, 3 ), 5 ), ( 0, Fraction( 7, 2 )), ( Decimal( '0.1' ), 2, Decimal( '0.1' )),
+            ( Decimal( '0.10' ), Decimal( '-1.3' ), Decimal( '-0.15' )), ( Decimal( 3 ), 10, 2 ))
+        for case in cases:
+            r = Range( *case )
+            start, stop, step = ( case[ 0 ], case[ 1 ], case[ 2 ]) if len( case ) == 3 else ( case[ 0 ], case[ 1 ], 1 )
+            data, value = [], start
+            while ( value < stop ) if step > 0 else ( value > stop ):
+                data. append( value )
+                value += step
+            self. assertEqual( r. length, len( data ))
+            self. assertEqual( list( r ), data )
+            self. assertEqual([ type( value ) for value in r ], [ type( value ) for value in data ])
+            self. assertEqual( list( reversed( r )), data[ ::-1 ])
+            self. assertEqual([ r. index( value ) for value in data ], list( range( len( data ))))
+            self. assertTrue( all( value in r for value in data ))
+            self. assertFalse( any( value + type( start )( step ) / 2 in r for value in data ))
+            self. assertNotIn( stop, r )
+            self. assertEqual( r. count( start - step ), 0 )
+        self. assertIn( 0.5, Range( Fraction( 1, 3 ), 5, Fraction( 1, 6 )))
+        self. assertNotIn( 0.1, Range( Decimal( 0 ), 1, Decimal( '0.1' )))
+        self. assertNotIn( Decimal( 'NaN' ), Range( Decimal( 0 ), 1, Decimal( '0.1' )))
+        # intersection is exact
+        for a, b in (
+            ( Range( Fraction( 1, 3 ), 10, Fraction( 1, 6 )), Range( Fraction( 1, 4 ), 10, Fraction( 1, 4 ))),
+            ( Range( Fraction( 1, 3 ), 10, Fraction( 1, 6 )), Range( 9, -3, -2 )),
+            ( Range( Fraction( 1, 3 ), 5 ), Range( Fraction( 1, 2 ), 5 )),
+            ( Range( Decimal( '0.1' ), 5, Decimal( '0.3' )), Range( 0, 7, 2 )),
+            ( Range( Decimal( '4.9' ), Decimal( '-2' ), Decimal( '-0.3' )), Range( Decimal( 0 ), 5, Decimal( '0.25' )))):
+            self. assertEqual( sorted( a & b ), sorted( set( a ) & set( b )))
+            self. assertEqual( sorted( b & a ), sorted( set( a ) & set( b )))
+        c = Range( Fraction( 1, 2 ), None, Fraction( 1, 2 )) & Range( 0, None, Fraction( 1, 3 ))
+        self. assertEqual( c, Range( 1, None, 1 ))
+        self. assertIs( type( c. start ), Fraction )
+
+    def test_float( self ):
+        import pickle
+        inf, nan = float( 'inf' ), float( 'nan' )
+        r = Range( 0.0, inf, 1.0 )
+        self. assertEqual(( r, r. length ), ( Range( 0.0, None, 1.0 ), None ))
+        self. assertTrue( 5.0 in r )
+        self. assertFalse( 5.5 in r )
+        self. assertEqual( Range( 10.0, -inf, -0.5 )[ 3 ], 8.5 )
+        self. assertEqual( Range( 0.0, -inf, 1.0 ). length, 0 )
+        for case in (( 0.0, 1e300, 1e-300 ), ( 0.0, nan, 1.0 ), ( nan, 5.0, 1.0 ), ( 0.0, 5.0, inf ), ( -inf, 5.0, 1.0 )):
+            self. assertRaises( ValueError, Range, *case )
+        # a step far below the ulp of stop, the length is bisected rather than walked to
+        for start, stop, step in (( 0.0, 1e30, 1.0 ), ( 1e30, 0.0, -1.0 ), ( 0.0, 1e24, 3.0 ), ( -1e25, 1e25, 7.0 )):
+            length = Range( start, stop, step ). length
+            before = ( lambda value: value < stop ) if step > 0 else ( lambda value: value > stop )
+            self. assertTrue( before( start + step * ( length - 1 )))
+            self. assertFalse( before( start + step * length ))
+        for case in (( 0.1, 2, 0.1 ), ( 0.5, 6.5, 1.5 ), ( 1, 0, -0.1 ), ( 0.0, 1e3, 0.1 ), ( 2.5, 2.5, 0.1 )):
+            r = Range( *case )
+            start, stop, step = case
+            data, i = [], 0
+            while ( start + step * i < stop ) if step > 0 else ( start + step * i > stop ):
+                data. append( start + step * i )
+                i += 1
+            self. assertIs( type( r. length ), int )
+            self. assertEqual( r. length, len( data ))
+            self. assertEqual( list( r ), data )
+            self. assertEqual( list( reversed( r )), data[ ::-1 ])
+            self. assertEqual( list( pickle. loads( pickle. dumps( r. iterator( len( data ) // 2 )))), data[ len( data ) // 2: ])
+            for index in { 0, 1, len( data ) // 2, len( data ) - 1 } if data else ():
+                self. assertIn( data[ index ], r )
+                self. assertEqual( r. index( data[ index ]), index )
+        r = Range( 0.1, 2, 0.1 )
+        self. assertEqual( r[ 2 ], 0.30000000000000004 )
+        self. assertNotIn( 0.3, r )
+        self. assertTrue( r. contains( 0.3, ulps = 1 ))
+        self. assertTrue( r. contains( 0.3, abs_tol = 1e-12 ))
+        self. assertEqual( r. index( 0.3, abs_tol = 1e-12 ), 2 )
+        self. assertFalse( r. contains( 0.35, abs_tol = 1e-12 ))
+        self. assertFalse( r. contains( 2.0, abs_tol = 1e-12 ))
+        self. assertRaises( ValueError, r. index, 0.3 )
+        self. assertRaises( ValueError, r. index, 0.35, abs_tol = 0.01 )
+        self. assertNotIn( float( 'nan' ), r )
+        self. assertEqual( r. contains_many([ 0.3, 0.30000000000000004, 2.0 ]), [ False, True, False ])
+        for args in (( 0, 1, 11 ), ( 0, 1, 10, False ), ( 5, -5, 7 ), ( 2, 3, 1 ), ( 2, 3, 0 ), ( 0, 1e-3, 1000 )):
+            self. assertEqual( Range. linspace( *args ). length, args[ 2 ])
+        self. assertEqual( list( Range. linspace( 0, 1, 5 )), [ 0.0, 0.25, 0.5, 0.75, 1.0 ])
+        self. assertRaises( ValueError, Range. linspace, 1, 1, 3 )
+
+    @unittest. skipIf( numpy is None, 'requires NumPy' )
+    def test_float_numpy( self ):
+        for args in (( 0, 1, 11 ), ( 0, 1, 10, False ), ( 5, -5, 7 ), ( -1.5, 1e3, 12345 )):
+            self. assertEqual( Range. linspace( *args ). to_numpy(). tolist(), numpy. linspace( *args ). tolist())
+        r = Range( 0.1, 2, 0.1 )
+        values = numpy. array([ 0.3, 0.30000000000000004, 0.1, 2.0, 1.9000000000000001, numpy. nan, -0.1 ])
+        self. assertEqual( r. contains_many( values ). tolist(), [ value in r for value in values. tolist()])
+        self. assertEqual( r. index_many( values ). tolist(), [ r. index( value ) if value in r else -1 for value in values. tolist()])
+
+    def test_numeric_types( self ):
+        import gc
+        from fractions import Fraction
+        from rangeplus import register_numeric_type
+        from rangeplus. rangeplus import _kinds, _ExactEngine
+        class Index:
+            def __init__( self, value ):
+                self. value = value
+            def __index__( self ):
+                return self. value
+        self. assertEqual( Range( Index( 5 ), Index( 50 ), Index( 5 )), Range( 5, 50, 5 ))
+        self. assertEqual( Range( 10 )[ Index( 3 )], 3 )
+        key = id( Index )
+        self. assertEqual( _kinds[ key ], 'index' )
+        del Index
+        gc. collect()
+        self. assertNotIn( key, _kinds )
+        self. assertRaises( TypeError, Range, 'spam' )
+        self. assertRaises( TypeError, register_numeric_type, 5 )
+        class Rational( Fraction ):
+            pass
+        self. assertNotIsInstance( Range( Rational( 1, 3 ), 2, Rational( 1, 6 )). _engine, _ExactEngine )
+        register_numeric_type( Rational, exact = True )
+        r = Range( Rational( 1, 3 ), 2, Rational( 1, 6 ))
+        self. assertIsInstance( r. _engine, _ExactEngine )
+        self. assertEqual( list( r ), [ Fraction( i, 6 ) for i in range( 2, 12 )])
+        self. assertIs( type( r[ 3 ]), Rational )
+        self. assertEqual( r. index( Rational( 5, 6 )), 3 )
+
+    def test_interned( self ):
+        Range. clear_interned()
+        r = Range. interned( 0, 4096, 64 )
+        self. assertIs( Range. interned( 0, 4096, 64 ), r )
+        self. assertIs( Range. interned( 0, 4090, 64 ), r )
+        self. assertIs( Range. interned( 7, 8 ), Range. interned( 7, 9, 5 ))
+        self. assertIs( Range. interned( 5, 5 ), Range. interned( 9, 0 ))
+        self. assertIs( Range. interned( 3, None, 2 ), Range. interned( 3, None, 2 ))
+        self. assertIsNot( Range. interned( 3, None, 2 ), Range. interned( 3, None, 3 ))
+        self. assertIsNot( Range. interned( 0, 4096, 64 ), Range. interned( 0.0, 4096, 64 ))
+        self. assertIs( type( Range. interned( 0.0, 4096, 64 ). start ), float )
+        Range. interned( 0, 10.0 )
+        r = Range. interned( 0, 10 )
+        self. assertIs( type( r. stop ), int )
+        self. assertEqual( r. range, range( 10 ))
+        self. assertIsNot( Range. interned( 0, 0 ), Range. interned( 0.0, 0.0 ))
+        from decimal import Decimal
+        a = Range. interned( Decimal( '0' ), Decimal( '1' ), Decimal( '0.1' ))
+        b = Range. interned( Decimal( '0' ), Decimal( '1' ), Decimal( '0.10' ))
+        self. assertIsNot( a, b )
+        self. assertEqual( list( map( str, b )), list( map( str, Range( Decimal( '0' ), Decimal( '1' ), Decimal( '0.10' )))))
+        self. assertIs( Range. interned( Decimal( '0' ), Decimal( '1' ), Decimal( '0.1' )), a )
+        self. assertIs( Range. interned( Decimal( '0' ), Decimal( '1.0' ), Decimal( '0.1' )), a )
+        self. assertEqual( str( Range. interned( Decimal( '0.0' ), Decimal( '1' ), Decimal( '0.1' )). start ), '0.0' )
+        self. assertIsNot( Range. interned( 0.0, 1.0, 0.5 ), Range. interned( -0.0, 1.0, 0.5 ))
+        self. assertEqual( str( Range. interned( -0.0, 1.0, 0.5 ). start ), '-0.0' )
+        self. assertIsNot( Range. interned( 1, 5 ), Range. interned( True, 5 ))
+        self. assertEqual( Range. interned( 0, 4090, 64 ), Range( 0, 4090, 64 ))
+        class Index:
+            __hash__ = None
+            def __index__( self ):
+                return 10
+        self. assertEqual( Range. interned( Index()), Range( 10 ))
+        self. assertRaises( TypeError, Range. interned, 'spam' )
+        Range. clear_interned()
+        self. assertIsNot( Range. interned( 0, 4096, 64 ), r )
+
+    def test_intersector( self ):
+        import pickle
+        from fractions import Fraction
+        from rangeplus import Range_intersector
+        others = [ Range( 1000, -5, -4 ), Range( 3, 90, 9 ), range( 50, 10, -5 ), Range( 7, None, 14 ), Range( 200, None, -7 ),
+            Range( 1, 100, 2 ), Range( 0 ), Range( -60, -6, 6 ), Range( Fraction( 1, 2 ), 40, Fraction( 3, 2 ))]
+        for r in ( Range( 0, 300, 6 ), Range( 300, -1, -6 ), Range( 12, None, 6 ), Range( 12, None, -6 ), Range( 5, 5 ), Range( 0.5, 30, 1.5 )):
+            intersector = r. intersector()
+            for other in others:
+                with self. subTest( r = r, other = other ):
+                    self. assertEqual( intersector( other ), r & other )
+                    if ( r & other ). length != 0:
+                        self. assertEqual( intersector( other ). step > 0, r. step > 0 )
+            self. assertEqual( r. intersect_many( others ), [ r & other for other in others ])
+            self. assertEqual( pickle. loads( pickle. dumps( intersector )). range, r )
+        self. assertIsInstance( Range( 10 ). intersector(), Range_intersector )
+
+    def test_relations( self ):
+        from fractions import Fraction
+        def elements( r ):      # the elements of r, unbound Ranges up to +-1000
+            return set( r if r. stop is not None else Range( r. start, 1000 if r. step > 0 else -1000, r. step ))
+        ranges = [ Range( 0, 60, 6 ), Range( 60, 0, -4 ), Range( 12, 36, 12 ), Range( 3, None, 9 ), Range( 30, None, -3 ),
+            Range( 12, None, 12 ), Range( 5, 5 ), Range( 7, 8 ), range( 48, 0, -12 ), Range( 100, 200, 7 )]
+        for a in ranges[ : -1 ]:
+            for b in ranges:
+                with self. subTest( a = a, b = b ):
+                    a = a if type( a ) is Range else Range( a )
+                    common = elements( a ) & elements( b )
+                    self. assertEqual( a. isdisjoint( b ), not common )
+                    unbound = a. stop is None and b. stop is None and len( common ) > 10
+                    self. assertEqual( a. overlap_count( b ), None if unbound else len( common ))
+                    self. assertEqual( a. overlap_count( b ), ( a & b ). length )
+                    self. assertEqual( a. issubset( b ), elements( a ) <= elements( b ) and ( a. stop is not None or b. stop is None ))
+                    self. assertEqual( a. issuperset( b ), elements( b ) <= elements( a ) and ( b. stop is not None or a. stop is None ))
+        self. assertEqual( Range( 0, 100, 7 ). count_between( 10, 50 ), 6 )
+        self. assertEqual( Range( 100, 0, -7 ). count_between( 10, 52 ), 6 )
+        self. assertEqual( Range( 0, 100, 7 ). count_between( 50, 10 ), 0 )
+        self. assertEqual( Range( 3, None, 7 ). count_between( None, 50 ), 7 )
+        self. assertIsNone( Range( 3, None, 7 ). count_between( 10, None ))
+        self. assertIsNone( Range( 3, None, -7 ). count_between( None, 0 ))
+        self. assertEqual( Range( 3, None, -7 ). count_between( -1000, 0 ), len( range( -4, -1000, -7 )))
+        self. assertEqual( Range( 0.1, 2, 0.1 ). count_between( 0.3, 0.7 ), len([ x for x in Range( 0.1, 2, 0.1 ) if 0.3 <= x < 0.7 ]))
+        for r, lo, hi in (( Range( 10 ), 2.5, 7.5 ), ( Range( 0, 1, 0.1 ), 0.3, 0.7 ), ( Range( 10, -10, -3 ), -7.5, 4.5 ),
+                ( Range( 10 ), float( '-inf' ), float( 'inf' )), ( Range( 10 ), float( 'nan' ), 5 )):
+            count = r. count_between( lo, hi )
+            self. assertIs( type( count ), int )
+            self. assertEqual( count, len([ x for x in r if lo <= x < hi ]))
+        self. assertEqual( Range( 5, None ). count_between( float( '-inf' ), 9 ), 4 )
+        # a step below the ulp of the bounds, the indices are bisected rather than walked to
+        r = Range( 0.0, 1e21, 1.0 )
+        count = r. count_between( 5e20, None )
+        first = r. length - count
+        self. assertTrue( r[ first - 1 ] < 5e20 <= r[ first ])
+        r = Range( 0.0, None, 1.0 )
+        first, end = r. count_between( None, 5e20 ), r. count_between( None, 6e20 )
+        self. assertTrue( r[ first - 1 ] < 5e20 <= r[ first ] and r[ end - 1 ] < 6e20 <= r[ end ])
+        self. assertEqual( r. count_between( 5e20, 6e20 ), end - first )
+        a = Range( Fraction( 1, 2 ), 10, Fraction( 1, 2 ))
+        self. assertTrue( Range( 1, 10 ). issubset( a ))
+        self. assertTrue( a. issuperset( range( 1, 10 )))
+        self. assertTrue( a. issuperset( range( 9, 0, -1 )))
+        self. assertFalse( a. issuperset( range( 10, 0, -1 )))
+        self. assertEqual( a. overlap_count( Range( 1, 10, 2 )), 5 )
+        self. assertEqual( a. count_between( 1, Fraction( 5, 2 )), 3 )
+        from decimal import Decimal
+        r = Range( Decimal( -5 ), Decimal( 5 ), Decimal( '0.5' ))
+        self. assertEqual( r. count_between( Decimal( '-2.25' ), Decimal( '1.25' )), 7 )
+
+    def test_affine( self ):
+        from fractions import Fraction
+        for r in ( Range( 3, 50, 4 ), Range( 50, 3, -4 ), Range( 5, 5 ), Range( Fraction( 1, 3 ), 4, Fraction( 1, 2 ))):
+            with self. subTest( r = r ):
+                self. assertEqual( list( r * 3 + 7 ), [ x * 3 + 7 for x in r ])
+                self. assertEqual( list( 7 - 3 * r ), [ 7 - 3 * x for x in r ])
+                self. assertEqual( list( -r - 1 ), [ -x - 1 for x in r ])
+        self. assertEqual( Range( 3, None, 4 ) * -2 + 1, Range( -5, None, -8 ))
+        self. assertEqual( Range( 10 ) + 5, Range( 5, 15 ))
+        r = Range( 0.1, 2, 0.1 ) + 0.2
+        self. assertEqual(( len( r ), r. start, r. step ), ( 19, 0.1 + 0.2, 0.1 ))
+        self. assertEqual( len( Range( 10 ) * 0.1 ), 10 )
+        self. assertRaises( TypeError, lambda: Range( 10 ) + Range( 10 ))
+        self. assertRaises( TypeError, lambda: Range( 10 ) * 'a' )
+        self. assertRaises( ValueError, lambda: Range( 10 ) * 0 )
+
+    def test_affine_preimage( self ):
+        from fractions import Fraction
+        ranges = [ Range( 0, 100, 3 ), Range( 100, 0, -7 ), Range( -20, None, 3 ), Range( 40, None, -3 ), Range( 5, 5 )]
+        targets = [ Range( 0, 300, 5 ), range( 300, -100, -11 ), Range( 7, None, 4 ), Range( 7, None, -4 ), Range( 0 )]
+        def window( r ):
+            return r if r. stop is not None else r[ : 200 ]
+        for r in ranges:
+            for a, b in (( 1, 0 ), ( 3, 1 ), ( -2, 5 ), ( 0, 10 ), ( 0, 11 )):
+                for target in targets:
+                    with self. subTest( r = r, a = a, b = b, target = target ):
+                        preimage = r. affine_preimage( a, b, target )
+                        expected = [ x for x in window( r ) if a * x + b in target ]
+                        self. assertEqual([ x for x in window( preimage ) if x in window( r )], expected[ : 200 ])
+                        if len( expected ) > 1:
+                            self. assertEqual( preimage. step > 0, r. step > 0 )
+        self. assertEqual( Range( 0, 100, 3 ). affine_preimage( Fraction( 1, 2 ), 0, Range( 0, 20, 5 )), Range( 0, 60, 30 ))
+        self. assertEqual( list( Range( 0.0, 10.0, 1.0 ). affine_preimage( 2.0, 1.0, range( 0, 20, 3 ))), [ 1.0, 4.0, 7.0 ])
+        self. assertRaises( TypeError, Range( 10 ). affine_preimage, 'a', 0, Range( 5 ))
+
+    def test_to_array( self ):
+        from array import array
+        cases = (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 0, 0, 1 ))
+        for case in cases:
+            self. assertEqual( Range( *case ). to_array( 'q' ), array( 'q', range( *case )))
+        self. assertEqual( list( Range( 0.5, 6.5, 1.5 ). to_array( 'd' )), [ 0.5 + 1.5 * i for i in range( 4 )])
+        self. assertRaises( ValueError, Range( None ). to_array, 'q' )
+        buffer = array( 'q', [ 0 ] * 5 )
+        self. assertEqual( Range( 10, None, -3 ). fill_into( buffer ), 5 )
+        self. assertEqual( buffer, array( 'q', [ 10, 7, 4, 1, -2 ]))
+        self. assertEqual( Range( 1, 4 ). fill_into( buffer ), 3 )
+        self. assertEqual( buffer, array( 'q', [ 1, 2, 3, 1, -2 ]))
+        self. assertRaises( TypeError, Range( 3 ). fill_into, b'abc' )
+
+    # fill_into() raises the same errors whether or not NumPy has been imported
+    def test_fill_into_errors( self ):
+        from array import array
+        from unittest import mock
+        def check():
+            self. assertRaises( OverflowError, Range( 300 ). fill_into, bytearray( 300 ))
+            self. assertRaises( OverflowError, Range( -1, 3 ). fill_into, array( 'Q', [ 0 ] * 4 ))
+            self. assertRaises( TypeError, Range( 0.0, 4.0, 1.0 ). fill_into, array( 'q', [ 0 ] * 4 ))
+            buffer = bytearray( 3 )
+            self. assertEqual( Range( 250, 260 ). fill_into( buffer ), 3 )
+            self. assertEqual( list( buffer ), [ 250, 251, 252 ])
+        check()
+        with mock. patch. dict( sys. modules ):
+            sys. modules. pop( 'numpy', None )
+            check()
+
+    @unittest. skipIf( numpy is None, 'requires NumPy' )
+    def test_to_numpy( self ):
+        from fractions import Fraction
+        cases = (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 0, 0, 1 ))
+        for case in cases:
+            self. assertEqual( Range( *case ). to_numpy(). tolist(), list( range( *case )))
+            self. assertEqual( numpy. asarray( Range( *case ), dtype = float ). tolist(), list( map( float, range( *case ))))
+        self. assertEqual( Range( 0.5, 6.5, 1.5 ). to_numpy(). tolist(), [ 0.5 + 1.5 * i for i in range( 4 )])
+        self. assertEqual( Range( 2**70, 2**70 + 3 ). to_numpy(). tolist(), list( range( 2**70, 2**70 + 3 )))
+        self. assertEqual( Range( Fraction( 1, 3 ), 2, Fraction( 1, 3 )). to_numpy(). dtype, object )
+        self. assertRaises( ValueError, Range( None ). to_numpy )
+        buffer = numpy. zeros( 8, dtype = numpy. int32 )
+        self. assertEqual( Range( 5, None, 2 ). fill_into( buffer[ ::2 ]), 4 )
+        self. assertEqual( buffer. tolist(), [ 5, 0, 7, 0, 9, 0, 11, 0 ])
+        self. assertRaises( OverflowError, Range( 300 ). to_numpy, numpy. int8 )
+        self. assertRaises( OverflowError, Range( 2**70, 2**70 + 3 ). to_numpy, numpy. uint64 )
+        self. assertRaises( TypeError, Range( 0.5, 3, 1.0 ). to_numpy, numpy. int64 )
+        self. assertEqual( Range( 100, -28, -1 ). to_numpy( numpy. int8 ). tolist(), list( range( 100, -28, -1 )))
+
+    def test_many( self ):
+        values = list( range( -60, 60 ))
+        cases = (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 0, 0, 1 ), ( 10, None, 7 ), ( 10, None, -7 ))
+        for case in cases:
+            r = Range( *case )
+            self. assertEqual( r. contains_many( values ), [ value in r for value in values ])
+            self. assertEqual( r. count_many( values ), [ r. count( value ) for value in values ])
+            self. assertEqual( r. index_many( values ), [ r. index( value ) if value in r else -1 for value in values ])
+
+    @unittest. skipIf( numpy is None, 'requires NumPy' )
+    def test_many_numpy( self ):
+        from fractions import Fraction
+        values = numpy. arange( -60, 60 )
+        cases = (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 0, 0, 1 ), ( 10, None, 7 ), ( 10, None, -7 ),
+            ( -2**63, 2**63 - 1, 5 ), ( 2**63 - 10, None, 3 ), ( 2**70, None, 3 ), ( 1.0, 50.0, 2.0 ), ( Fraction( 1, 2 ), 30, 2 ))
+        for case in cases:
+            r = Range( *case )
+            for array in ( values, values. astype( float ), values. astype( numpy. int8 ), values. reshape( 10, 12 ),
+                    numpy. array([ -2**63, 2**63 - 1, 2**63 - 7, 0, 5 ])):
+                # integral floats are matched exactly, as the ints they equal
+                flat = [ int( value ) if type( value ) is float else value for value in array. ravel(). tolist()]
+                self. assertEqual( r. contains_many( array ). ravel(). tolist(), [ value in r for value in flat ])
+                self. assertEqual( r. count_many( array ). ravel(). tolist(), [ r. count( value ) for value in flat ])
+                self. assertEqual( r. index_many( array ). ravel(). tolist(), [ r. index( value ) if value in r else -1 for value in flat ])
+
+    def test_many_numpy_exact( self ):
+        self. assertEqual( Range( 2**60, 2**60 + 100, 7 ). contains_many( numpy. array([ 2**60 + 7, 2**60 + 8 ], numpy. uint64 )). tolist(), [ True, False ])
+        self. assertEqual( Range( -2**63, None ). index_many( numpy. array([ 2**62 + 1 ])). tolist(), [ 2**63 + 2**62 + 1 ])
+        self. assertEqual( Range( 0, 2**64 + 5 ). index_many( numpy. array([ 2**63 + 1, 2**64 - 1 ], numpy. uint64 )). tolist(), [ 2**63 + 1, 2**64 - 1 ])
+        self. assertEqual( Range( 2**64 - 1, 0, -3 ). index_many( numpy. array([ 2**64 - 4, 2**64 - 5, 3 ], numpy. uint64 )). tolist(), [ 1, -1, 2**64 // 3 - 1 ])
+        self. assertEqual( Range( -2**63, 2**63, 5 ). contains_many( numpy. array([ -58.0, -57.0, -58.5 ])). tolist(), [ True, False, False ])
+        self. assertEqual( Range( 2**70, None, 3 ). index_many( numpy. array([ 2**63 - 1 ], numpy. int64 )). tolist(), [ -1 ])
+
+    def test_take( self ):
+        cases = (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 0, 0, 1 ), ( 10, None, 7 ), ( 10, None, -7 ))
+        for case in cases:
+            r = Range( *case )
+            length = r. length if r. length is not None else 20
+            for indices in ([ 0, 1, 2 ], [ -1, -2 ], [ 0, length - 1 ], [ length ], [ -length ], [ -length - 1 ], []):
+                try:
+                    expect = [ r[ i ] for i in indices ]
+                except IndexError:
+                    self. assertRaises( IndexError, r. take, indices )
+                    self. assertRaises( IndexError, r. __getitem__, indices )
+                else:
+                    self. assertEqual( r. take( indices ), expect )
+                    self. assertEqual( r[ indices ], expect )
+        mask = [ True, False ] * 5
+        self. assertEqual( Range( 10 )[ mask ], [ 0, 2, 4, 6, 8 ])
+        self. assertEqual( Range( None )[ mask ], [ 0, 2, 4, 6, 8 ])
+        self. assertRaises( IndexError, Range( 9 ). take, mask )
+
+    @unittest. skipIf( numpy is None, 'requires NumPy' )
+    def test_take_numpy( self ):
+        cases = (( 10, ), ( 10, 50, 3 ), ( 50, 10, -3 ), ( 10, None, 7 ), ( 10, None, -7 ), ( 1.0, 9.0, 2.0 ),
+            ( -2**63 + 5, 2**63 - 1, 2**40 ), ( 0, 2**65 ))
+        for case in cases:
+            r = Range( *case )
+            indices = numpy. array([[ 0, 1 ], [ 3, 2 ]])
+            self. assertEqual( r[ indices ]. tolist(), [[ r[ 0 ], r[ 1 ]], [ r[ 3 ], r[ 2 ]]])
+            if r. length is not None:
+                self. assertEqual( r. take( -indices ). tolist(), [[ r[ 0 ], r[ -1 ]], [ r[ -3 ], r[ -2 ]]])
+            else:
+                self. assertRaises( IndexError, r. take, -indices )
+        self. assertRaises( IndexError, Range( 5 ). take, numpy. array([ 5 ]))
+        self. assertRaises( IndexError, Range( 5 ). take, numpy. array([ 1.0 ]))
+        self. assertEqual( Range( 1, 6 )[ numpy. array([ True, False, True, False, True ])]. tolist(), [ 1, 3, 5 ])
+
+    def test_aggregates( self ):
+        import statistics
+        from fractions import Fraction
+        cases = (( 10, ), ( 3, 50, 7 ), ( 50, 3, -7 ), ( 1, 2 ), ( 5, 5 ), ( 2**70, 2**70 + 1000, 3 ),
+            ( Fraction( 1, 3 ), Fraction( 10, 3 ), Fraction( 1, 3 )))
+        for case in cases:
+            r, data = Range( *case ), list( Range( *case ))
+            self. assertEqual( r. sum(), sum( data ))
+            self. assertEqual( r. sum_of_squares(), sum( x * x for x in data ))
+            self. assertEqual( r. first, data[ 0 ] if data else None )
+            self. assertEqual( r. last, data[ -1 ] if data else None )
+            if data:
+                self. assertEqual( r. mean(), statistics. mean( data ))
+                self. assertEqual( r. min(), min( data ))
+                self. assertEqual( r. max(), max( data ))
+                self. assertAlmostEqual( r. variance(), statistics. pvariance( data ), delta = 1e-9 * r. variance())
+            else:
+                for aggregate in ( r. mean, r. min, r. max, r. variance ):
+                    self. assertRaises( ValueError, aggregate )
+        self. assertEqual( Range( 10**12 ). sum(), 10**12 * ( 10**12 - 1 ) // 2 )
+        self. assertEqual( Range( 1, 10 ). variance( 1 ), statistics. variance( range( 1, 10 )))
+        self. assertEqual( Range( 5, None, -1 ). max(), 5 )
+        self. assertIsNone( Range( 5, None, -1 ). last )
+        for aggregate in ( 'sum', 'mean', 'min', 'sum_of_squares', 'variance' ):
+            self. assertRaises( ValueError, getattr( Range( 5, None, -1 ), aggregate ))
+
+    def test_random( self ):
+        import pickle, random
+        rng = random. Random( 7 )
+        r = Range( 5, 5000, 3 )
+        sample = r. sample( 100, rng )
+        self. assertEqual( len( set( sample )), 100 )
+        self. assertTrue( all( value in r for value in sample ))
+        self. assertEqual( sorted( r. sample( r. length, rng )), list( r ))
+        self. assertRaises( ValueError, r. sample, r. length + 1 )
+        self. assertEqual( len( Range( 2**64 ). sample( 5 )), 5 )
+        self. assertIn( r. choice( rng ), r )
+        self. assertRaises( IndexError, Range( 0 ). choice )
+        for sampler in ( Range( None ). choice, lambda: Range( None ). sample( 1 ), lambda: Range( None ). shuffled()):
+            self. assertRaises( ValueError, sampler )
+        for length in ( 0, 1, 2, 3, 10, 1000, 4097 ):
+            r = Range( 5, 5 + 3 * length, 3 )
+            permutation = r. shuffled( 42 )
+            data = list( permutation )
+            self. assertEqual( sorted( data ), list( r ))
+            self. assertEqual([ permutation. index( value ) for value in data ], list( range( length )))
+            self. assertEqual( list( pickle. loads( pickle. dumps( permutation ))), data )
+            self. assertEqual( list( r. shuffled( 42 )), data )
+        permutation = Range( 2**64 ). shuffled()
+        self. assertEqual( permutation. index( permutation[ -12345 ]), 2**64 - 12345 )
+
+    def test_chunks( self ):
+        for case in (( 10, ), ( 10, 0, -3 ), ( -5, 100, 7 ), ( 0, )):
+            r = Range( *case )
+            for size in ( 1, 2, 3, 50 ):
+                chunks = list( r. chunks( size ))
+                self. assertEqual([ value for chunk in chunks for value in chunk ], list( r ))
+                self. assertTrue( all( chunk. length == size for chunk in chunks[ :-1 ]))
+                self. assertEqual( list( r. batches( size )), [ list( chunk ) for chunk in chunks ])
+                self. assertEqual( list( r. batches( size, tuple )), [ tuple( chunk ) for chunk in chunks ])
+        chunks = Range( 5, None, -2 ). chunks( 4 )
+        self. assertEqual([ next( chunks ) for i in range( 3 )], [ Range( 5, -3, -2 ), Range( -3, -11, -2 ), Range( -11, -19, -2 )])
+        self. assertEqual( next( Range( 2**70, None ). batches( 2 )), [ 2**70, 2**70 + 1 ])
+        self. assertRaises( ValueError, Range( 10 ). chunks, 0 )
+        self. assertRaises( ValueError, Range( 10 ). batches, 2, set )
+
+    @unittest. skipIf( numpy is None, 'requires NumPy' )
+    def test_batches_numpy( self ):
+        batches = list( Range( 10, 0, -3 ). batches( 3, numpy ))
+        self. assertEqual([ batch. tolist() for batch in batches ], [[ 10, 7, 4 ], [ 1 ]])
+        self. assertEqual( next( Range( 7, None, 7 ). batches( 3, 'numpy' )). tolist(), [ 7, 14, 21 ])
+
+    def test_partition( self ):
+        for case in (( 10, ), ( 10, 0, -3 ), ( -5, 100, 7 ), ( 0, ), ( 3, )):
+            r = Range( *case )
+            for n in ( 1, 2, 3, 4, 7 ):
+                parts = r. partition( n )
+                self. assertEqual( len( parts ), n )
+                self. assertEqual([ value for part in parts for value in part ], list( r ))
+                self. assertLessEqual( max( part. length for part in parts ) - min( part. length for part in parts ), 1 )
+                self. assertEqual([ r. shard( i, n ) for i in range( n )], parts )
+                shards = [ r. shard( i, n, 'strided' ) for i in range( n )]
+                self. assertEqual( sorted( value for shard in shards for value in shard ), sorted( r ))
+                self. assertEqual([ list( shard ) for shard in shards ], [ list( r )[ i::n ] for i in range( n )])
+        self. assertEqual( Range( 2**70 ). shard( 3, 4 ), Range( 3 * 2**68, 2**70 ))
+        self. assertEqual( sum( part. length for part in Range( 2**70 + 3 ). partition( 7 )), 2**70 + 3 )
+        self. assertEqual( Range( 5, None, -2 ). shard( 1, 3, 'strided' ), Range( 3, None, -6 ))
+        self. assertRaises( ValueError, Range( None ). partition, 2 )
+        self. assertRaises( ValueError, Range( None ). shard, 0, 2 )
+        self. assertRaises( ValueError, Range( 10 ). partition, 0 )
+        self. assertRaises( ValueError, Range( 10 ). shard, 0, 2, 'random' )
+        self. assertRaises( IndexError, Range( 10 ). shard, 2, 2 )
+
     def test_cast( self ):
         cases = (( 10, ), ( -10, ), ( 10, 200, 13 ), ( 10, -200, -13 ))
         for case in cases:
@@ -0,0 +1,49 @@
+# Tests for rangeplus.parallel
+
+import sys, operator, unittest
+from concurrent. futures import ThreadPoolExecutor
+from itertools import islice
+sys. path. insert( 0, '..' )
+from rangeplus import Range
+from rangeplus. parallel import pmap, preduce
+
+def square( value ):
+    return value * value
+
+class ParallelTest(unittest.TestCase):
+
+    def test_pmap( self ):
+        for backend in ( 'thread', 'process' ):
+            for case in (( 100, ), ( 100, 0, -7 ), ( 0, ), ( 2**70, 2**70 + 50, 3 )):
+                r = Range( *case )
+                for chunk in ( None, 1, 8 ):
+                    expect = [ value * value for value in r ]
+                    self. assertEqual( list( pmap( square, r, 3, chunk, backend )), expect )
+                    self. assertEqual( sorted( pmap( square, r, 3, chunk, backend, ordered = False )), sorted( expect ))
+        self. assertEqual( list( pmap( square, range( 5 ), 2, backend = 'thread' )), [ 0, 1, 4, 9, 16 ])
+        with ThreadPoolExecutor( 2 ) as executor:
+            self. assertEqual( list( pmap( square, Range( 5 ), backend = executor )), [ 0, 1, 4, 9, 16 ])
+        self. assertRaises( ValueError, pmap, square, Range( 5 ), backend = 'cluster' )
+        self. assertRaises( ValueError, pmap, square, Range( 5 ), 0 )
+
+    def test_pmap_unbound( self ):
+        for backend in ( 'thread', 'process' ):
+            results = pmap( square, Range( 10, None, -3 ), 2, 5, backend )
+            self. assertEqual( list( islice( results, 30 )), [ value * value for value in range( 10, -80, -3 )])
+            results. close()
+
+    def test_preduce( self ):
+        for backend in ( 'thread', 'process' ):
+            for case in (( 1000, ), ( 1000, 0, -7 ), ( 1, ), ( 2**70, 2**70 + 50, 3 )):
+                r = Range( *case )
+                self. assertEqual( preduce( square, r, operator. add, workers = 3, chunk = 7, backend = backend ),
+                    sum( value * value for value in r ))
+            self. assertEqual( preduce( None, Range( 10 ), operator. add, backend = backend ), 45 )
+            self. assertEqual( preduce( str, Range( 12 ), operator. add, chunk = 5, backend = backend ), '01234567891011' )
+            self. assertEqual( preduce( None, Range( 0 ), operator. add, 0, backend = backend ), 0 )
+        self. assertRaises( TypeError, preduce, None, Range( 0 ), operator. add, backend = 'thread' )
+        self. assertRaises( ValueError, preduce, None, Range( None ), operator. add )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# Tests for RangeArray
+#
+# Every vectorized operation of RangeArray is checked against the same operation
+# applied to each of its rows as a Range.
+
+import sys, random, unittest
+sys. path. insert( 0, '..' )
+from rangeplus import Range, RangeArray
+from rangeplus import rangearray
+
+def random_ranges( count, magnitude ):
+    steps = ( 1, 2, 3, 4, 5, 6, 7, 10, -1, -2, -3, -5, -7, -12 )
+    return [ Range( random. randint( -magnitude, magnitude ),
+        None if random. random() < 0.25 else random. randint( -magnitude, magnitude ),
+        random. choice( steps ) * ( random. randint( 1, magnitude ) if random. random() < 0.1 else 1 ))
+        for i in range( count )]
+
+class RangeArrayTest(unittest.TestCase):
+
+    def setUp( self ):
+        random. seed( 5 )
+
+    def check( self, magnitude ):
+        a, b = random_ranges( 2000, magnitude ), random_ranges( 2000, magnitude )
+        ra, rb = RangeArray( a ), RangeArray( b )
+        self. assertEqual( ra. tolist(), a )
+        self. assertEqual( list( ra. length ), [ -1 if r. length is None else r. length for r in a ])
+        self. assertEqual(( ra & rb ). tolist(), [ r0 & r1 for r0, r1 in zip( a, b )])
+        self. assertEqual(( ra & range( 3, 200, 7 )). tolist(), [ r & range( 3, 200, 7 ) for r in a ])
+        for value in ( 0, 7, -13, magnitude ):
+            self. assertEqual( list( ra. contains( value )), [ value in r for r in a ])
+
+    def test_int64( self ):
+        self. check( 300 )
+
+    def test_bigint( self ):
+        self. check( 2**80 )
+
+    def test_extremes( self ):
+        a = [ Range( -2**63, 2**63 - 1, 3 ), Range( 2**63 - 1, -2**63, -5 ), Range( 5, None, -2 ), Range( 0 )]
+        ra = RangeArray( a )
+        for value in ( -2**63, 2**63 - 1, 2**63 - 6, 3, -1, 2**63 + 5 ):
+            self. assertEqual( list( ra. contains( value )), [ value in r for r in a ])
+        self. assertEqual( ra[ 1 ], a[ 1 ])
+        self. assertEqual( ra[ 1:3 ]. tolist(), a[ 1:3 ])
+        self. assertRaises( TypeError, RangeArray, [ Range( 0.5, 3 )])
+        self. assertRaises( ValueError, ra. __and__, ra[ :2 ])
+
+    def test_without_numpy( self ):
+        optional_numpy = rangearray. _optional_numpy
+        rangearray. _optional_numpy = lambda: None
+        try:
+            a = random_ranges( 200, 300 )
+            ra = RangeArray( a )
+            self. assertIs( type( ra. start ), list )
+            self. assertEqual(( ra & Range( 0, 100 )). tolist(), [ r & Range( 0, 100 ) for r in a ])
+            self. assertEqual( ra. contains( 7 ), [ 7 in r for r in a ])
+        finally:
+            rangearray. _optional_numpy = optional_numpy
+
+
+if __name__ == "__main__":
+    unittest.main()
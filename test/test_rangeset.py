@@ -0,0 +1,78 @@
+# Tests for RangeSet
+#
+# RangeSet operations are checked against the same operations on Python sets
+# of the elements.
+
+import sys, random, unittest
+sys. path. insert( 0, '..' )
+from rangeplus import Range, RangeSet
+
+def random_ranges():
+    steps = ( 1, 2, 3, 4, 5, 6, -1, -2, -3, -4 )
+    return [ Range( random. randint( -100, 100 ), random. randint( -100, 100 ), random. choice( steps ))
+        for i in range( random. randint( 0, 4 ))]
+
+class RangeSetTest(unittest.TestCase):
+
+    def setUp( self ):
+        random. seed( 3 )
+
+    def check( self, result, expect ):
+        ordered = sorted( expect )
+        self. assertEqual( list( result ), ordered )
+        self. assertEqual( result. length, len( expect ))
+        for value in range( -110, 110 ):
+            self. assertEqual( value in result, value in expect )
+            if value in expect:
+                self. assertEqual( result. index( value ), ordered. index( value ))
+            else:
+                self. assertRaises( ValueError, result. index, value )
+
+    def test_operators( self ):
+        for i in range( 300 ):
+            a, b = random_ranges(), random_ranges()
+            sa, sb = set(). union( *map( set, a )), set(). union( *map( set, b ))
+            ra, rb = RangeSet( a ), RangeSet( b )
+            self. check( ra, sa )
+            self. check( ra | rb, sa | sb )
+            self. check( ra & rb, sa & sb )
+            self. check( ra - rb, sa - sb )
+            self. check( ra ^ rb, sa ^ sb )
+
+    def test_operands( self ):
+        rs = RangeSet([ Range( 3, 6 )])
+        self. assertEqual( list( range( 10 ) - rs ), [ 0, 1, 2, 6, 7, 8, 9 ])
+        self. assertEqual( list( Range( 5 ) | rs ), [ 0, 1, 2, 3, 4, 5 ])
+        self. assertEqual( list( Range( 5 ) & rs ), [ 3, 4 ])
+        self. assertEqual( list( rs ^ range( 4, 8 )), [ 3, 6, 7 ])
+        self. assertRaises( ValueError, RangeSet, [ Range( None )])
+        self. assertRaises( ValueError, RangeSet, [ Range( 0.5, 3 )])
+
+    def test_normalized( self ):
+        self. assertEqual( RangeSet([ Range( 0, 100, 2 ), Range( 1, 100, 2 )]). ranges, ( Range( 100 ), ))
+        self. assertEqual( RangeSet([ Range( 0, 10 ), Range( 10, 20 ), Range( 20, 30, 2 )]). ranges, ( Range( 20 ), Range( 20, 30, 2 )))
+        self. assertEqual( RangeSet([ Range( 5, -5, -1 )]), Range( -4, 6 ))
+        huge = RangeSet([ Range( 10**12 )]) - Range( 0, 10**12, 1000 )
+        self. assertEqual( huge. length, 10**12 - 10**9 )
+        self. assertEqual( huge. index( 1001 ), 999 )
+        self. assertNotIn( 10**9, huge )
+
+
+    # many Ranges, which took quadratic time when each one was merged into the set built so far
+    def test_many( self ):
+        count = 5000
+        pieces = [ Range( i * 10, i * 10 + 5 ) for i in range( count )]
+        random. shuffle( pieces )
+        ra = RangeSet( pieces + [ Range( 50, 150 ), Range( 3, 7500, 10 )])
+        expect = set(). union( *map( set, pieces )) | set( range( 50, 150 )) | set( range( 3, 7500, 10 ))
+        self. assertEqual( list( ra ), sorted( expect ))
+        rb = RangeSet( Range( i * 10 + 3, i * 10 + 8 ) for i in range( count ))
+        sb = set(). union( *( range( i * 10 + 3, i * 10 + 8 ) for i in range( count )))
+        for result, expected in (( ra | rb, expect | sb ), ( ra & rb, expect & sb ), ( ra - rb, expect - sb ), ( ra ^ rb, expect ^ sb )):
+            self. assertEqual( result. length, len( expected ))
+            self. assertEqual( result. index( max( expected )), len( expected ) - 1 )
+        self. assertNotEqual( ra, rb )
+        self. assertEqual( ra, RangeSet( reversed( ra. ranges )))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# Tests for rangeplus.stats
+
+import sys, unittest
+sys. path. insert( 0, '..' )
+from rangeplus import Range, stats
+
+class Item:
+    def __init__( self, value ):
+        self. value = value
+    def __eq__( self, other ):
+        return other == self. value
+    __hash__ = None
+
+class StatsTest(unittest.TestCase):
+
+    def setUp( self ):
+        stats. reset()
+
+    def tearDown( self ):
+        stats. disable()
+
+    def test_disabled( self ):
+        contains = Range. __contains__
+        stats. enable()
+        self. assertIsNot( Range. __contains__, contains )
+        stats. disable()
+        self. assertIs( Range. __contains__, contains )
+        self. assertFalse( stats. enabled())
+        self. assertIn( 5, Range( 10 ))
+        self. assertEqual( stats. snapshot()[ 'calls' ], {})
+
+    def test_paths( self ):
+        r = Range( 0, 100, 3 )
+        with stats. recording() as snapshot:
+            self. assertIn( 6, r )
+            self. assertTrue( Item( 6 ) in r )
+            self. assertEqual( r. count( Item( 7 )), 0 )
+            self. assertEqual( r. index( 9 ), 3 )
+            self. assertRaises( ValueError, r. index, 10 )
+            self. assertRaises( ValueError, Range( 0.5, 10 ). index, Item( 1 ))
+            self. assertEqual( r & Range( 0, 100, 2 ), Range( 0, 100, 6 ))
+            self. assertEqual( list( r[ :3 ]), [ 0, 3, 6 ])
+            result = snapshot()
+        self. assertFalse( stats. enabled())
+        self. assertEqual( result[ 'calls' ], {
+            '__contains__': { 'arithmetic': 1, 'linear': 1 },
+            'count': { 'linear': 1 },
+            'index': { 'arithmetic': 1, 'error': 2 },
+            '__and__': { 'arithmetic': 1 },
+            '__getitem__': { 'arithmetic': 1 },
+            '__iter__': { 'arithmetic': 1 },
+        })
+        self. assertEqual( sum( result[ 'linear_callers' ]. values()), 2 )
+        self. assertTrue( all( name. split( ':' )[ 0 ]. endswith( 'test_stats.py' ) for name in result[ 'linear_callers' ]))
+        self. assertEqual( result[ 'timing' ], {})
+
+    def test_timing( self ):
+        with stats. recording( timing = True ) as snapshot:
+            for value in range( 10 ):
+                value in Range( 5 )
+            histogram = snapshot()[ 'timing' ][ '__contains__' ][ 'arithmetic' ]
+        self. assertEqual( sum( histogram. values()), 10 )
+        self. assertTrue( all( bound & ( bound - 1 ) == 0 for bound in histogram ))
+
+
+if __name__ == "__main__":
+    unittest.main()